@@ -0,0 +1,190 @@
+"""Per-catcher-per-game framing aggregation.
+
+Everything is computed with one grouped pass over the called pitches, so the
+cost is linear in the number of rows whether the input is one day or a season.
+"""
+import numpy as np
+import pandas as pd
+
+from metrics import count_rows, timed
+from zones import is_in_shadow_zone, is_in_strike_zone
+
+CALLED_DESCRIPTIONS = ['called_strike', 'ball']
+MIN_CALLED_PITCHES = 5
+GROUP_KEYS = ['game_pk', 'fielder_2']
+
+# Enhanced team mapping for better accuracy
+TEAM_MAPPING = {
+    'LAA': 'LAA', 'ANA': 'LAA',  # Angels
+    'HOU': 'HOU',                 # Astros
+    'OAK': 'OAK',                 # Athletics
+    'SEA': 'SEA',                 # Mariners
+    'TEX': 'TEX',                 # Rangers
+    'CWS': 'CWS', 'CHW': 'CWS',  # White Sox
+    'CLE': 'CLE',                 # Guardians
+    'DET': 'DET',                 # Tigers
+    'KC': 'KC', 'KCR': 'KC',     # Royals
+    'MIN': 'MIN',                 # Twins
+    'NYY': 'NYY', 'NY': 'NYY',   # Yankees
+    'BAL': 'BAL',                 # Orioles
+    'BOS': 'BOS',                 # Red Sox
+    'TB': 'TB', 'TBR': 'TB',     # Rays
+    'TOR': 'TOR',                 # Blue Jays
+    'ATL': 'ATL',                 # Braves
+    'MIA': 'MIA', 'FLA': 'MIA',  # Marlins
+    'NYM': 'NYM',                 # Mets
+    'PHI': 'PHI',                 # Phillies
+    'WSH': 'WSH', 'WAS': 'WSH',  # Nationals
+    'CHC': 'CHC', 'CHI': 'CHC',  # Cubs
+    'CIN': 'CIN',                 # Reds
+    'MIL': 'MIL',                 # Brewers
+    'PIT': 'PIT',                 # Pirates
+    'STL': 'STL',                 # Cardinals
+    'ARI': 'ARI', 'AZ': 'ARI',   # Diamondbacks
+    'COL': 'COL',                 # Rockies
+    'LAD': 'LAD', 'LA': 'LAD',   # Dodgers
+    'SD': 'SD', 'SDP': 'SD',     # Padres
+    'SF': 'SF', 'SFG': 'SF'      # Giants
+}
+
+
+def called_pitch_mask(data):
+    """Called pitches with a catcher and full location data"""
+    return (
+        data['description'].isin(CALLED_DESCRIPTIONS) &
+        data['fielder_2'].notna() &
+        data['plate_x'].notna() &
+        data['plate_z'].notna() &
+        data['sz_top'].notna() &
+        data['sz_bot'].notna()
+    )
+
+
+def normalize_team(teams):
+    """Map raw team abbreviations onto TEAM_MAPPING, returning an object array (None for nulls)"""
+    # Normalize each distinct value once instead of every row
+    codes, uniques = pd.factorize(pd.Series(teams))
+    cleaned = [str(team).upper().strip() for team in uniques]
+    lookup = np.array([TEAM_MAPPING.get(team, team) for team in cleaned] + [None], dtype=object)
+    return lookup[codes]  # Missing values have code -1, which picks the trailing None
+
+
+def fielding_team(data):
+    """Team on defense for each pitch: home in the top of the inning, away in the bottom"""
+    home = normalize_team(data['home_team'])
+    away = normalize_team(data['away_team'])
+    if 'inning_topbot' in data:
+        bottom = (data['inning_topbot'] == 'Bot').to_numpy(dtype=bool, na_value=False)
+        team = np.where(bottom, away, home)
+    else:
+        team = home
+    if 'fielding_team' in data:
+        explicit = normalize_team(data['fielding_team'])
+        team = np.where(pd.isna(explicit), team, explicit)
+    team = np.where(pd.isna(team), away, team)
+    return np.where(pd.isna(team), 'UNK', team)
+
+
+def _matchup(away, home):
+    away = pd.Series(away, dtype=object).fillna('')
+    home = pd.Series(home, dtype=object).fillna('')
+    matchup = (away + ' vs ' + home).str.strip()
+    return matchup.mask((away == '') & (home == ''), 'Game').to_numpy()
+
+
+def aggregate_catcher_games(data, min_pitches=MIN_CALLED_PITCHES):
+    """Aggregate raw Statcast pitches into one row per (game_pk, catcher).
+
+    Returns a DataFrame with game_pk, catcher_id, game_date, team, matchup and
+    the framing counts (called/shadow pitches and strikes, extra/lost strikes),
+    in first-appearance order of game and catcher.
+    """
+    with timed('aggregation'):
+        return _aggregate_catcher_games(data, min_pitches)
+
+
+def _aggregate_catcher_games(data, min_pitches):
+    called = data[called_pitch_mask(data)]
+    columns = [
+        'game_pk', 'catcher_id', 'game_date', 'team', 'matchup', 'called_pitches', 'called_strikes',
+        'shadow_pitches', 'shadow_strikes', 'extra_strikes', 'lost_strikes',
+    ]
+    if called.empty:
+        return pd.DataFrame(columns=columns)
+
+    count_rows('aggregation', len(called))
+    is_strike = (called['description'] == 'called_strike').to_numpy()
+    with timed('zone_classification'):
+        in_zone = is_in_strike_zone(called)
+        in_shadow = is_in_shadow_zone(called)
+    flags = pd.DataFrame({
+        'game_pk': called['game_pk'].to_numpy(),
+        'fielder_2': called['fielder_2'].to_numpy(),
+        'called_pitches': 1,
+        'called_strikes': is_strike,
+        'shadow_pitches': in_shadow,
+        'shadow_strikes': in_shadow & is_strike,
+        # Extra strikes: called strikes that were actually balls
+        'extra_strikes': is_strike & ~in_zone,
+        # Lost strikes: called balls that were actually strikes
+        'lost_strikes': ~is_strike & in_zone,
+    })
+    grouped = flags.groupby(GROUP_KEYS, sort=False)
+    counts = grouped.sum().astype('int64')
+    counts = counts[counts['called_pitches'] >= min_pitches]
+    if counts.empty:
+        return pd.DataFrame(columns=columns)
+
+    # Most common fielding team per catcher-game
+    team_counts = pd.DataFrame({
+        'game_pk': flags['game_pk'],
+        'fielder_2': flags['fielder_2'],
+        'team': fielding_team(called),
+    }).value_counts(sort=True)
+    team = team_counts.reset_index().drop_duplicates(GROUP_KEYS).set_index(GROUP_KEYS)['team']
+
+    # Matchup and date come from the first pitch of each group
+    first_columns = [column for column in ('home_team', 'away_team', 'game_date') if column in called]
+    firsts = called[GROUP_KEYS + first_columns].groupby(GROUP_KEYS, sort=False).first()
+    firsts = firsts.reindex(columns=['home_team', 'away_team', 'game_date'])
+    firsts['home_team'] = normalize_team(firsts['home_team'])
+    firsts['away_team'] = normalize_team(firsts['away_team'])
+    firsts['game_date'] = pd.to_datetime(firsts['game_date']).dt.strftime('%Y-%m-%d')
+
+    result = counts.join(team).join(firsts)
+    result['matchup'] = _matchup(result['away_team'], result['home_team'])
+    result = result.reset_index().rename(columns={'fielder_2': 'catcher_id'})
+    result['catcher_id'] = result['catcher_id'].astype('int64')
+    result['game_pk'] = result['game_pk'].astype('int64')
+    return result[columns]
+
+
+def to_catcher_records(games, player_names, date=None):
+    """Turn aggregate_catcher_games() output into the /api/statcast/catchers payload"""
+    shadow_rate = np.where(
+        games['shadow_pitches'] > 0,
+        games['shadow_strikes'] / games['shadow_pitches'].where(games['shadow_pitches'] > 0, 1),
+        0
+    )
+    total_rate = games['called_strikes'] / games['called_pitches']
+    return [
+        {
+            "id": int(catcher_id),
+            "player_name": player_names.get(int(catcher_id), f"Player {int(catcher_id)}"),
+            "team": team,
+            "matchup": matchup,
+            "date": date or (game_date if isinstance(game_date, str) else None),
+            "game_pk": int(game_pk),
+            "called_strike_rate": round(float(cs_rate), 3),  # Shadow zones only
+            "total_strike_rate": round(float(all_rate), 3),  # All pitches for reference
+            "extra_strikes": int(extra),
+            "lost_strikes": int(lost),
+            "total_called_pitches": int(called),
+            "shadow_zone_pitches": int(shadow),
+        }
+        for catcher_id, team, matchup, game_date, game_pk, cs_rate, all_rate, extra, lost, called, shadow in zip(
+            games['catcher_id'], games['team'], games['matchup'], games['game_date'], games['game_pk'],
+            shadow_rate, total_rate, games['extra_strikes'], games['lost_strikes'],
+            games['called_pitches'], games['shadow_pitches'],
+        )
+    ]
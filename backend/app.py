@@ -1,450 +1,383 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
-import pandas as pd
 from datetime import datetime, timedelta
-import pybaseball as pyb
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.patches import Circle
-from matplotlib.lines import Line2D
-import seaborn as sns
-import io
 import base64
+import hashlib
+import os
+
+import metrics
+import plot_cache
+import summaries
+from aggregation import called_pitch_mask
+from pitch_ranges import MAX_RANGE_DAYS, load_catcher_pitches
+from players import get_player_name, get_player_names
+from plotting import PLOT_MIMETYPES
+from render_pool import RenderPoolBusy, get_render_pool
+from rollups import REQUEST_FETCH_DAYS, DaysNotStored, ensure_ingested, is_range_final, leaderboard, season_start
+from singleflight import SingleFlight
+from statcast_cache import get_statcast_day
+from strike_model import GridNotFitted, strikes_above_expected
 
 app = Flask(__name__)
-CORS(app)
+# X-Total-Count carries the match count of paged catcher lists
+CORS(app, expose_headers=['X-Total-Count'])
+# Request latency histograms. PROFILING_ENABLED=1 also lets ?profile=1 return a
+# cProfile summary of any request; it exposes internals, so it is off by default
+metrics.init_app(app, allow_profiling=os.environ.get('PROFILING_ENABLED', '0') == '1')
 
-# Constants
-BALL_RADIUS = 0.1208
+# Identical plot requests arriving together share one render
+_plot_renders = SingleFlight('plot')
 
-# Pitch colors from your original code
-PITCH_COLORS = {
-    'FF': '#D62828', 'SI': '#F77F00', 'FC': '#7F4F24', 'CH': '#43AA8B',
-    'FS': '#3A9D9A', 'FO': '#4ECDC4', 'SC': '#90BE6D', 'CU': '#48CAE4',
-    'KC': '#6930C3', 'CS': '#3A0CA3', 'SL': '#F9C74F', 'ST': '#F8961E', 'SV': '#90A0C0'
-}
+@app.route('/api/health')
+def health():
+    return jsonify({"status": "ok", "timestamp": datetime.now().isoformat()})
 
-# Enhanced team mapping for better accuracy
-TEAM_MAPPING = {
-    'LAA': 'LAA', 'ANA': 'LAA',  # Angels
-    'HOU': 'HOU',                 # Astros
-    'OAK': 'OAK',                 # Athletics
-    'SEA': 'SEA',                 # Mariners
-    'TEX': 'TEX',                 # Rangers
-    'CWS': 'CWS', 'CHW': 'CWS',  # White Sox
-    'CLE': 'CLE',                 # Guardians
-    'DET': 'DET',                 # Tigers
-    'KC': 'KC', 'KCR': 'KC',     # Royals
-    'MIN': 'MIN',                 # Twins
-    'NYY': 'NYY', 'NY': 'NYY',   # Yankees
-    'BAL': 'BAL',                 # Orioles
-    'BOS': 'BOS',                 # Red Sox
-    'TB': 'TB', 'TBR': 'TB',     # Rays
-    'TOR': 'TOR',                 # Blue Jays
-    'ATL': 'ATL',                 # Braves
-    'MIA': 'MIA', 'FLA': 'MIA',  # Marlins
-    'NYM': 'NYM',                 # Mets
-    'PHI': 'PHI',                 # Phillies
-    'WSH': 'WSH', 'WAS': 'WSH',  # Nationals
-    'CHC': 'CHC', 'CHI': 'CHC',  # Cubs
-    'CIN': 'CIN',                 # Reds
-    'MIL': 'MIL',                 # Brewers
-    'PIT': 'PIT',                 # Pirates
-    'STL': 'STL',                 # Cardinals
-    'ARI': 'ARI', 'AZ': 'ARI',   # Diamondbacks
-    'COL': 'COL',                 # Rockies
-    'LAD': 'LAD', 'LA': 'LAD',   # Dodgers
-    'SD': 'SD', 'SDP': 'SD',     # Padres
-    'SF': 'SF', 'SFG': 'SF'      # Giants
-}
+@app.route('/api/metrics')
+def get_metrics():
+    """Prometheus text-format stage timings, cache hit/miss counters and row counts"""
+    return Response(metrics.render_metrics(), mimetype='text/plain; version=0.0.4')
 
-def get_player_name(player_id):
-    """Get player name from MLB API"""
-    try:
-        import requests
-        url = f"https://statsapi.mlb.com/api/v1/people/{player_id}"
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            if 'people' in data and len(data['people']) > 0:
-                return data['people'][0]['fullName']
-    except:
-        pass
-    return f"Player {player_id}"
+def _iso_date(value):
+    """value as a normalized YYYY-MM-DD date; raises ValueError for anything else"""
+    return datetime.strptime(value, '%Y-%m-%d').strftime('%Y-%m-%d')
 
-def get_game_matchup(game_data):
-    """Get game matchup in format 'AWAY vs HOME'"""
-    try:
-        if len(game_data) > 0:
-            row = game_data.iloc[0]
-            home_team = None
-            away_team = None
-            
-            # Try to get home and away teams
-            if 'home_team' in row and pd.notna(row['home_team']):
-                home_team = TEAM_MAPPING.get(str(row['home_team']).upper().strip(), str(row['home_team']).upper().strip())
-            if 'away_team' in row and pd.notna(row['away_team']):
-                away_team = TEAM_MAPPING.get(str(row['away_team']).upper().strip(), str(row['away_team']).upper().strip())
-                
-            if home_team and away_team:
-                return f"{away_team} vs {home_team}"
-            elif home_team:
-                return f"vs {home_team}"
-            elif away_team:
-                return f"{away_team} vs"
-                
-    except Exception as e:
-        print(f"Error getting matchup: {e}")
-    
-    return "Game"
+def _encoded_response(body, encoded, etag, cache_control):
+    """Response in the best Content-Encoding the client accepts, with a strong per-encoding ETag"""
+    encoding = request.accept_encodings.best_match(list(encoded)) if encoded else None
+    if encoding:
+        response = Response(encoded[encoding], mimetype='application/json')
+        response.headers['Content-Encoding'] = encoding
+        response.set_etag(f"{etag}-{encoding}")
+    else:
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = cache_control
+    return response.make_conditional(request)
 
-def get_correct_team(catcher_data):
-    """Get correct team abbreviation with better logic"""
-    # Get the most common team for this catcher in this game
-    team_counts = {}
-    
-    for _, row in catcher_data.iterrows():
-        # Try different team fields
-        for field in ['fielding_team', 'home_team', 'away_team']:
-            if field in row and pd.notna(row[field]):
-                team = str(row[field]).upper().strip()
-                mapped_team = TEAM_MAPPING.get(team, team)
-                team_counts[mapped_team] = team_counts.get(mapped_team, 0) + 1
+@app.route('/api/statcast/catchers')
+def get_catchers():
+    """Catcher summaries for a date, optionally filtered by team, sorted and paged
     
-    # Return the most frequent team, or try to determine from game context
-    if team_counts:
-        return max(team_counts.items(), key=lambda x: x[1])[0]
+    Without team/sort/limit/offset the stored snapshot is sent byte for byte.
+    With them, X-Total-Count holds the number of matching catchers.
+    """
+    date = request.args.get('date', (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d'))
+    team = request.args.get('team')
+    sort = request.args.get('sort')
     
-    # Fallback: try to get from any row
-    if len(catcher_data) > 0:
-        row = catcher_data.iloc[0]
-        for field in ['fielding_team', 'home_team', 'away_team']:
-            if field in row and pd.notna(row[field]):
-                team = str(row[field]).upper().strip()
-                return TEAM_MAPPING.get(team, team)
+    try:
+        date = _iso_date(date)
+    except ValueError:
+        return jsonify({'error': 'date must be a YYYY-MM-DD date'}), 400
+    try:
+        limit = request.args.get('limit')
+        limit = None if limit is None else int(limit)
+        offset = int(request.args.get('offset', 0))
+    except ValueError:
+        return jsonify({'error': 'limit and offset must be integers'}), 400
+    if (limit is not None and limit < 0) or offset < 0:
+        return jsonify({'error': 'limit and offset must not be negative'}), 400
     
-    return "UNK"
+    try:
+        # Precomputed by worker.py for finished days; built on demand otherwise
+        snapshot = summaries.get_snapshot(date)
+        cache_control = summaries.cache_control_for(snapshot)
+        
+        if not (team or sort or limit is not None or offset):
+            print(f"Returning {len(snapshot.records())} catchers")
+            return _encoded_response(snapshot.body, snapshot.encoded, snapshot.etag, cache_control)
+        
+        try:
+            total, page = summaries.query_summaries(snapshot.records(), team=team, sort=sort, limit=limit, offset=offset)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        print(f"Returning {len(page)} of {total} catchers")
+        body = summaries.serialize(page)
+        encoded = summaries.encode_body(body, best=False) if len(body) >= summaries.MIN_COMPRESS_BYTES else {}
+        # Same snapshot and query, same bytes: the ETag can be taken from the body
+        response = _encoded_response(body, encoded, hashlib.sha256(body).hexdigest(), cache_control)
+        response.headers['X-Total-Count'] = str(total)
+        return response
+        
+    except Exception as e:
+        print(f"Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify([])
 
-def is_in_strike_zone(row):
-    """Determine if pitch is in the true strike zone"""
-    return (
-        (row['plate_x'] - BALL_RADIUS <= 0.7083) &
-        (row['plate_x'] + BALL_RADIUS >= -0.7083) &
-        (row['plate_z'] + BALL_RADIUS >= row['sz_bot']) &
-        (row['plate_z'] - BALL_RADIUS <= row['sz_top'])
-    )
+def _days_not_stored(e):
+    """503 for a range that needs a backfill before it can be served"""
+    print(f"Range not stored: {e}")
+    response = jsonify({'error': str(e), 'missing_days': len(e.days)})
+    response.status_code = 503
+    return response
 
-def is_in_shadow_zone(row):
-    """Determine if pitch is in shadow zone based on Baseball Savant attack zone definitions"""
-    x = row['plate_x']
-    z = row['plate_z']
-    sz_top = row['sz_top']
-    sz_bot = row['sz_bot']
+@app.route('/api/leaderboard')
+def get_leaderboard():
+    """Framing leaderboard summed over a date range (defaults to season-to-date)"""
+    end = request.args.get('end', (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d'))
+    start = request.args.get('start')
+    min_pitches = request.args.get('min_pitches', 0, type=int)
     
-    # Expanded shadow zone margins
-    horizontal_margin = 0.3   # About 3.6 inches
-    vertical_margin = 0.4     # About 4.8 inches - bigger for top/bottom
-    edge_margin = 0.2         # Borderline inside zone
+    try:
+        end = _iso_date(end)
+        # Season-to-date starts at the season's first stored day, not Jan 1
+        start = _iso_date(start) if start else min(season_start(end[:4]), end)
+    except ValueError:
+        return jsonify({'error': 'start and end must be YYYY-MM-DD dates'}), 400
+    if start > end:
+        return jsonify({'error': 'start must not be after end'}), 400
     
-    # Horizontal shadow zones (left and right of plate)
-    in_horizontal_shadow = (
-        # Right shadow (attack zone 12, 13, 14)
-        ((x > 0.7083) & (x <= 0.7083 + horizontal_margin) & (z >= sz_bot - vertical_margin) & (z <= sz_top + vertical_margin)) |
-        # Left shadow (attack zone 11, 16, 17) 
-        ((x < -0.7083) & (x >= -0.7083 - horizontal_margin) & (z >= sz_bot - vertical_margin) & (z <= sz_top + vertical_margin))
-    )
+    try:
+        print(f"Building leaderboard for {start} to {end} (min {min_pitches} pitches)")
+        
+        # Only days that haven't been rolled up yet touch Statcast, and only a
+        # few of them; longer gaps are backfilled by ingest.py or the worker
+        ensure_ingested(start, end, fetch_limit=REQUEST_FETCH_DAYS)
+        board = leaderboard(start, end, min_pitches=min_pitches)
+        
+        player_names = get_player_names([row['id'] for row in board])
+        for row in board:
+            row['player_name'] = player_names[row['id']]
+        
+        print(f"Returning {len(board)} catchers")
+        return jsonify(board)
+        
+    except DaysNotStored as e:
+        return _days_not_stored(e)
+        
+    except Exception as e:
+        print(f"Error building leaderboard: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/leaderboard/expected')
+def get_expected_leaderboard():
+    """Strikes above expected per catcher over a date range (defaults to season-to-date)
     
-    # Vertical shadow zones (above and below strike zone) - EXPANDED
-    in_vertical_shadow = (
-        # Upper shadow (attack zone 18, 19) - bigger margin
-        ((z > sz_top) & (z <= sz_top + vertical_margin) & (x >= -0.7083 - horizontal_margin) & (x <= 0.7083 + horizontal_margin)) |
-        # Lower shadow - bigger margin
-        ((z < sz_bot) & (z >= sz_bot - vertical_margin) & (x >= -0.7083 - horizontal_margin) & (x <= 0.7083 + horizontal_margin))
-    )
+    Each called pitch is scored against the season's called-strike probability
+    grid (see strike_model.py) instead of the rulebook box.
+    """
+    end = request.args.get('end', (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d'))
+    start = request.args.get('start')
+    min_pitches = request.args.get('min_pitches', 0, type=int)
     
-    # Borderline inside zone (edges of zones 1, 2, 3, 4, 6, 7, 8, 9) - slightly expanded
-    barely_in_zone = (
-        # Right edge of zone
-        ((x > 0.7083 - edge_margin) & (x <= 0.7083) & (z >= sz_bot) & (z <= sz_top)) |
-        # Left edge of zone  
-        ((x < -0.7083 + edge_margin) & (x >= -0.7083) & (z >= sz_bot) & (z <= sz_top)) |
-        # Top edge of zone - expanded
-        ((z > sz_top - edge_margin) & (z <= sz_top) & (x >= -0.7083) & (x <= 0.7083)) |
-        # Bottom edge of zone - expanded
-        ((z < sz_bot + edge_margin) & (z >= sz_bot) & (x >= -0.7083) & (x <= 0.7083))
-    )
+    try:
+        end = _iso_date(end)
+        start = _iso_date(start) if start else min(season_start(end[:4]), end)
+    except ValueError:
+        return jsonify({'error': 'start and end must be YYYY-MM-DD dates'}), 400
+    if start > end:
+        return jsonify({'error': 'start must not be after end'}), 400
     
-    return in_horizontal_shadow | in_vertical_shadow | barely_in_zone
+    try:
+        print(f"Scoring strikes above expected for {start} to {end} (min {min_pitches} pitches)")
+        
+        # Makes sure every day in the range is in the local store before scoring
+        ensure_ingested(start, end, fetch_limit=REQUEST_FETCH_DAYS)
+        board = strikes_above_expected(start, end, min_pitches=min_pitches)
+        
+        player_names = get_player_names([row['id'] for row in board])
+        for row in board:
+            row['player_name'] = player_names[row['id']]
+        
+        print(f"Returning {len(board)} catchers")
+        return jsonify(board)
+        
+    except DaysNotStored as e:
+        return _days_not_stored(e)
+        
+    except GridNotFitted as e:
+        print(f"Grid not fit: {e}")
+        return jsonify({'error': str(e)}), 503
+        
+    except Exception as e:
+        print(f"Error scoring strikes above expected: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
 
-def plot_gameday_summary_inferno_shadow_only(df, player_name, matchup_date):
-    """Your gameday summary plot but ONLY for shadow zone pitches"""
-    
-    # FILTER TO SHADOW ZONES ONLY based on coordinates
-    shadow_mask = df.apply(is_in_shadow_zone, axis=1)
-    df = df[shadow_mask].copy()
-    
-    if df.empty:
-        # Create empty plot if no shadow zone data
-        fig, ax = plt.subplots(figsize=(8, 8))
-        ax.text(0.5, 0.5, 'No shadow zone pitch data available\n(borderline pitches)', 
-                ha='center', va='center', transform=ax.transAxes, color='white')
-        ax.set_facecolor('black')
-        fig.patch.set_facecolor('black')
-        return fig
+def render_catcher_plot(catcher_id, game_pk, date, fmt='png'):
+    """Return (digest, image bytes) for a catcher/game plot, or (None, None) if there's no data"""
+    def render():
+        # Get the data for this catcher (same cached day the list view pulled)
+        data = get_statcast_day(date)
+        with metrics.timed('plot_select'):
+            catcher_data = data[
+                (data['fielder_2'] == catcher_id) & 
+                (data['game_pk'] == game_pk) &
+                called_pitch_mask(data)
+            ]
+        
+        if catcher_data.empty:
+            return None
+        
+        print(f"Found {len(catcher_data)} total called pitches")
+        
+        player_name = get_player_name(catcher_id)
+        
+        # Generate shadow zone only plot in the render pool (filtering happens inside the function)
+        with metrics.timed(f'plot_render_{fmt}'):
+            return get_render_pool().render(catcher_data, player_name, date, fmt)
     
-    # Calculate true strike zone for shadow zone pitches
-    df['true_strike'] = (
-        (df['plate_x'] - BALL_RADIUS <= 0.7083) &
-        (df['plate_x'] + BALL_RADIUS >= -0.7083) &
-        (df['plate_z'] + BALL_RADIUS >= df['sz_bot']) &
-        (df['plate_z'] - BALL_RADIUS <= df['sz_top'])
+    # Finished games are rendered once and then served from the plot cache
+    return _plot_renders.do(
+        (catcher_id, game_pk, date, fmt),
+        lambda: plot_cache.get_or_render(catcher_id, game_pk, date, render, fmt)
     )
 
-    # Only called pitches in shadow zones
-    called_df = df[df['description'].isin(['called_strike', 'ball'])].copy()
-    
-    if called_df.empty:
-        # Create empty plot if no called shadow zone data
-        fig, ax = plt.subplots(figsize=(8, 8))
-        ax.text(0.5, 0.5, 'No called pitches in shadow zones\n(borderline pitches)', 
-                ha='center', va='center', transform=ax.transAxes, color='white')
-        ax.set_facecolor('black')
-        fig.patch.set_facecolor('black')
-        return fig
-        
-    strike_kde = called_df[called_df['description'] == 'called_strike']
+def render_catcher_range_plot(catcher_id, start, end, fmt='png'):
+    """Return (digest, image bytes) for a catcher's plot over [start, end], or (None, None)"""
+    def render():
+        # Streamed day by day from the local store (see pitch_ranges.py)
+        with metrics.timed('plot_range_select'):
+            catcher_data = load_catcher_pitches(catcher_id, start, end)
+        
+        if catcher_data.empty:
+            return None
+        
+        print(f"Found {len(catcher_data)} called shadow zone pitches from {start} to {end}")
+        
+        player_name = get_player_name(catcher_id)
+        
+        with metrics.timed(f'plot_render_{fmt}'):
+            return get_render_pool().render(catcher_data, player_name, f"{start} to {end}", fmt)
     
-    # SHADOW ZONE CALLED STRIKE RATE
-    cs_pct = len(strike_kde) / len(called_df) if len(called_df) > 0 else 0
-    extra_count = len(called_df[(called_df['description'] == 'called_strike') & (~called_df['true_strike'])])
-    lost_count = len(called_df[(called_df['description'] == 'ball') & (called_df['true_strike'])])
-
-    fig, ax = plt.subplots(figsize=(8, 8))
-    ax.grid(False)
-
-    # Original Inferno KDE Heatmap (only shadow zone strikes)
-    if len(strike_kde) > 0:
-        sns.kdeplot(
-            x=strike_kde['plate_x'], y=strike_kde['plate_z'],
-            fill=True, cmap='inferno', alpha=0.5, ax=ax, levels=100, thresh=0.05, linewidths=0
-        )
-
-    # Plot only shadow zone pitches
-    for _, row in called_df.iterrows():
-        color = PITCH_COLORS.get(row['pitch_type'], 'white')
-        linestyle = 'solid' if row['stand'] == 'R' else (0, (1, 1, 0, 1))
-        x, z = row['plate_x'], row['plate_z']
-        if row['description'] == 'called_strike':
-            ax.add_patch(Circle((x, z), BALL_RADIUS, edgecolor=color, facecolor=color, lw=1.5, linestyle=linestyle, alpha=0.8))
-            ax.add_patch(Circle((x, z), BALL_RADIUS, edgecolor='white', facecolor='none', lw=2.2, linestyle=linestyle))
-            if not row['true_strike']:
-                ax.text(x, z, '*', color='white', fontsize=12, weight='bold', ha='center', va='center')
-        else:
-            ax.plot(x, z, marker='x', color=color, markersize=13, mew=3, alpha=0.8)
-            if row['true_strike']:
-                ax.text(x, z, '*', color='white', fontsize=12, weight='bold', ha='center', va='center')
-
-    # Strike zone
-    zone_top, zone_bot = 3.5, 1.5
-    ax.plot([-0.7083, 0.7083], [zone_top, zone_top], color='white', lw=2, linestyle='dotted')
-    ax.plot([-0.7083, 0.7083], [zone_bot, zone_bot], color='white', lw=2, linestyle='dotted')
-    ax.plot([-0.7083, -0.7083], [zone_bot, zone_top], color='white', lw=2)
-    ax.plot([0.7083, 0.7083], [zone_bot, zone_top], color='white', lw=2)
-    ax.plot([-0.7083, 0.7083], [0.56, 0.56], color='white', lw=2)
-
-    # Axes and styling
-    ax.set_xlim(-1.5, 1.5)
-    ax.set_ylim(0.5, 4.5)
-    ax.set_aspect('equal', adjustable='datalim')
-    ax.set_xticks([-1.5, -1.0, -0.7083, -0.5, -0.25, 0, 0.25, 0.5, 0.7083, 1.0, 1.5])
-    ax.set_xticklabels(['18"', '12"', 'Edge', '6"', '3"', '0"', '3"', '6"', 'Edge', '12"', '18"'])
-    ax.set_xlabel("Horizontal Distance from Plate Center", fontsize=11, labelpad=12, color='white', weight='bold')
-    ax.set_ylabel("Vertical Position (feet from ground)", fontsize=11, labelpad=10, color='white', weight='bold')
-    ax.tick_params(color='white', labelcolor='white', width=1.5, length=6, labelsize=10)
-    for spine in ax.spines.values():
-        spine.set_color('white')
-        spine.set_linewidth(1.5)
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-
-    # Text and annotations - UPDATED TEXT
-    ax.text(0, 0.64, "Catcher's Perspective", ha='center', va='center', fontsize=9, color='white')
-    anchor_x, anchor_y = 1.58, 1.25
-    ax.text(anchor_x, anchor_y, "Shadow Zone CS Rate:", fontsize=10, color='white', ha='center', weight='bold')
-    ax.text(anchor_x, anchor_y - 0.115, f"{cs_pct:.1%}", fontsize=14, color='white', ha='center', weight='bold')
-    ax.text(anchor_x, anchor_y - 0.245, f"Extra Strikes: {extra_count}", fontsize=10, color='white', ha='center', weight='bold')
-    ax.text(anchor_x, anchor_y - 0.335, f"Lost Strikes: {lost_count}", fontsize=10, color='white', ha='center', weight='bold')
-    ax.text(anchor_x, anchor_y - 0.435, "*Extra/Lost Call", fontsize=8, color='white', ha='center', style='italic')
-    ax.text(anchor_x, anchor_y - 0.535, f"n = {len(called_df)} pitches", fontsize=8, color='white', ha='center', style='italic')
-    ax.text(-1.83, 0.68, "@KICKDIRTBB", fontsize=9, color='white', weight='bold', style='italic')
-
-    # Title
-    ax.set_title(f"{player_name}\nShadow Zone Summary - {matchup_date}",
-                 fontsize=14, color='white', weight='bold', pad=20)
-
-    # Legend
-    pitch_types = sorted(df['pitch_type'].dropna().unique())
-    pitch_legend = [Line2D([0], [0], marker='o', linestyle='None', label=pt,
-        markerfacecolor=PITCH_COLORS.get(pt, 'white'), markeredgecolor='none', markersize=10)
-        for pt in pitch_types if pt in PITCH_COLORS]
-    legend_elements = pitch_legend + [
-        Line2D([0], [0], marker='o', color='white', label='CS vs RHH',
-               markerfacecolor='none', markeredgecolor='white', markersize=10, lw=2, linestyle='solid'),
-        Line2D([0], [0], marker='o', color='white', label='CS vs LHH',
-               markerfacecolor='none', markeredgecolor='white', markersize=10, lw=2, linestyle=(0, (1, 1, 0, 1))),
-        Line2D([0], [0], marker='x', color='white', label='Ball',
-               markersize=10, linestyle='None', markeredgewidth=2)
-    ]
-    ax.legend(handles=legend_elements, loc='upper left', frameon=True,
-              facecolor='black', edgecolor='white', labelcolor='white').set_bbox_to_anchor((0.01, 1.01))
+    # Cached like a game plot once every day in the range is rolled up for good
+    return _plot_renders.do(
+        (catcher_id, f"range-{start}", end, fmt),
+        lambda: plot_cache.get_or_render(catcher_id, f"range-{start}", end, render, fmt,
+                                         is_final=lambda: is_range_final(start, end))
+    )
 
-    fig.patch.set_facecolor('black')
-    ax.set_facecolor('black')
-    plt.tight_layout()
+@app.route('/api/plot/<int:catcher_id>')
+def generate_range_plot(catcher_id):
+    """Shadow zone plot over a series, month or season (start/end, format=png|webp|svg)
     
-    return fig
-
-@app.route('/api/health')
-def health():
-    return jsonify({"status": "ok", "timestamp": datetime.now().isoformat()})
-
-@app.route('/api/statcast/catchers')
-def get_catchers():
-    date = request.args.get('date', (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d'))
+    Large ranges switch from per-pitch markers to a called-strike-rate hexbin.
+    """
+    end = request.args.get('end', (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d'))
+    start = request.args.get('start')
+    fmt = request.args.get('format', 'png').lower()
+    
+    if fmt not in PLOT_MIMETYPES:
+        return jsonify({'error': f"Unsupported format '{fmt}', use one of: {', '.join(PLOT_MIMETYPES)}"}), 400
+    try:
+        end = _iso_date(end)
+        start = _iso_date(start) if start else min(season_start(end[:4]), end)
+        start_day, end_day = datetime.fromisoformat(start), datetime.fromisoformat(end)
+    except ValueError:
+        return jsonify({'error': 'start and end must be YYYY-MM-DD dates'}), 400
+    if start > end:
+        return jsonify({'error': 'start must not be after end'}), 400
+    if (end_day - start_day).days >= MAX_RANGE_DAYS:
+        return jsonify({'error': f'Ranges are limited to {MAX_RANGE_DAYS} days'}), 400
     
     try:
-        print(f"Fetching Statcast data for {date}...")
-        
-        # Fetch real Statcast data
-        data = pyb.statcast(start_dt=date, end_dt=date)
-        
-        if data.empty:
-            print("No data found for this date")
-            return jsonify([])
-        
-        # Filter for called pitches with catcher data
-        called_data = data[
-            data['description'].isin(['called_strike', 'ball']) &
-            data['fielder_2'].notna() &
-            data['plate_x'].notna() &
-            data['plate_z'].notna() &
-            data['sz_top'].notna() &
-            data['sz_bot'].notna()
-        ].copy()
-        
-        if called_data.empty:
-            return jsonify([])
-        
-        print(f"Found {len(called_data)} called pitches")
-        
-        # Add zone classifications
-        called_data['in_strike_zone'] = is_in_strike_zone(called_data)
-        
-        # SHADOW ZONE: Based on coordinates, not zone numbers
-        called_data['in_shadow_zone'] = called_data.apply(is_in_shadow_zone, axis=1)
-        
-        catchers = []
-        
-        for game_pk in called_data['game_pk'].unique():
-            game_data = called_data[called_data['game_pk'] == game_pk]
-            
-            for catcher_id in game_data['fielder_2'].unique():
-                catcher_data = game_data[game_data['fielder_2'] == catcher_id]
-                
-                if len(catcher_data) >= 5:  # Minimum 5 called pitches
-                    
-                    # SHADOW ZONE ANALYSIS (borderline pitches only)
-                    shadow_pitches = catcher_data[catcher_data['in_shadow_zone']]
-                    
-                    if len(shadow_pitches) > 0:
-                        shadow_strikes = len(shadow_pitches[shadow_pitches['description'] == 'called_strike'])
-                        shadow_strike_rate = shadow_strikes / len(shadow_pitches)
-                    else:
-                        shadow_strike_rate = 0
-                    
-                    # FRAMING ANALYSIS (on all pitches)
-                    # Extra strikes: called strikes that were actually balls
-                    extra_strikes = len(catcher_data[
-                        (catcher_data['description'] == 'called_strike') & 
-                        (~catcher_data['in_strike_zone'])
-                    ])
-                    
-                    # Lost strikes: called balls that were actually strikes  
-                    lost_strikes = len(catcher_data[
-                        (catcher_data['description'] == 'ball') & 
-                        (catcher_data['in_strike_zone'])
-                    ])
-                    
-                    # Total called strike rate (for reference)
-                    total_called_strikes = len(catcher_data[catcher_data['description'] == 'called_strike'])
-                    total_strike_rate = total_called_strikes / len(catcher_data)
-                    
-                    player_name = get_player_name(int(catcher_id))
-                    team = get_correct_team(catcher_data)
-                    matchup = get_game_matchup(catcher_data)
-                    
-                    catchers.append({
-                        "id": int(catcher_id),
-                        "player_name": player_name,
-                        "team": team,
-                        "matchup": matchup,
-                        "date": date,
-                        "game_pk": int(game_pk),
-                        "called_strike_rate": round(shadow_strike_rate, 3),  # Shadow zones only
-                        "total_strike_rate": round(total_strike_rate, 3),    # All pitches for reference
-                        "extra_strikes": int(extra_strikes),
-                        "lost_strikes": int(lost_strikes),
-                        "total_called_pitches": len(catcher_data),
-                        "shadow_zone_pitches": len(shadow_pitches)
-                    })
-        
-        print(f"Returning {len(catchers)} catchers")
-        return jsonify(catchers)
+        print(f"Generating shadow zone {fmt} for catcher {catcher_id} from {start} to {end}")
+        
+        digest, image = render_catcher_range_plot(catcher_id, start, end, fmt)
+        
+        if image is None:
+            return jsonify({'error': 'No data found for this catcher in this range'}), 404
+        
+        response = Response(image, mimetype=PLOT_MIMETYPES[fmt])
+        response.set_etag(digest)
+        response.headers['Cache-Control'] = plot_cache.cache_control_for(end, is_range_final(start, end))
+        return response.make_conditional(request)
+        
+    except DaysNotStored as e:
+        return _days_not_stored(e)
+        
+    except RenderPoolBusy as e:
+        print(f"Plot renderer busy: {e}")
+        response = jsonify({'error': str(e)})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response
         
     except Exception as e:
-        print(f"Error: {e}")
+        print(f"Error generating range plot: {e}")
         import traceback
         traceback.print_exc()
-        return jsonify([])
+        return jsonify({'error': str(e)}), 500
 
 @app.route('/api/plot/<int:catcher_id>/<int:game_pk>')
 def generate_plot(catcher_id, game_pk):
-    """Generate matplotlib plot for a specific catcher/game - SHADOW ZONES ONLY"""
+    """Generate matplotlib plot for a specific catcher/game - SHADOW ZONES ONLY
+    
+    Returns the PNG base64-encoded in JSON; kept for older clients, new code
+    should use the /image endpoint below.
+    """
     date = request.args.get('date', (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d'))
     
+    try:
+        date = _iso_date(date)
+    except ValueError:
+        return jsonify({'error': 'date must be a YYYY-MM-DD date'}), 400
+    
     try:
         print(f"Generating shadow zone plot for catcher {catcher_id}, game {game_pk}, date {date}")
         
-        # Get the data for this catcher
-        data = pyb.statcast(start_dt=date, end_dt=date)
-        catcher_data = data[
-            (data['fielder_2'] == catcher_id) & 
-            (data['game_pk'] == game_pk) &
-            data['description'].isin(['called_strike', 'ball']) &
-            data['plate_x'].notna() &
-            data['plate_z'].notna() &
-            data['sz_top'].notna() &
-            data['sz_bot'].notna()
-        ].copy()
+        digest, png = render_catcher_plot(catcher_id, game_pk, date)
         
-        if catcher_data.empty:
+        if png is None:
             return jsonify({'error': 'No data found for this catcher/game'}), 404
         
-        print(f"Found {len(catcher_data)} total called pitches")
+        img_base64 = base64.b64encode(png).decode()
+        response = jsonify({'image': f'data:image/png;base64,{img_base64}'})
+        response.set_etag(digest)
+        response.headers['Cache-Control'] = plot_cache.cache_control_for(date)
+        return response.make_conditional(request)
         
-        player_name = get_player_name(catcher_id)
+    except RenderPoolBusy as e:
+        print(f"Plot renderer busy: {e}")
+        response = jsonify({'error': str(e)})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response
         
-        # Generate shadow zone only plot (filtering happens inside the function)
-        fig = plot_gameday_summary_inferno_shadow_only(catcher_data, player_name, date)
+    except Exception as e:
+        print(f"Error generating plot: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/plot/<int:catcher_id>/<int:game_pk>/image')
+def generate_plot_image(catcher_id, game_pk):
+    """Same plot as generate_plot(), returned as a raw image (format=png|webp|svg)"""
+    date = request.args.get('date', (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d'))
+    fmt = request.args.get('format', 'png').lower()
+    
+    if fmt not in PLOT_MIMETYPES:
+        return jsonify({'error': f"Unsupported format '{fmt}', use one of: {', '.join(PLOT_MIMETYPES)}"}), 400
+    try:
+        date = _iso_date(date)
+    except ValueError:
+        return jsonify({'error': 'date must be a YYYY-MM-DD date'}), 400
+    
+    try:
+        print(f"Generating shadow zone {fmt} for catcher {catcher_id}, game {game_pk}, date {date}")
+        
+        digest, image = render_catcher_plot(catcher_id, game_pk, date, fmt)
+        
+        if image is None:
+            return jsonify({'error': 'No data found for this catcher/game'}), 404
         
-        # Convert to base64
-        img_buffer = io.BytesIO()
-        fig.savefig(img_buffer, format='png', bbox_inches='tight', dpi=150)
-        img_buffer.seek(0)
-        img_base64 = base64.b64encode(img_buffer.read()).decode()
-        plt.close(fig)
+        response = Response(image, mimetype=PLOT_MIMETYPES[fmt])
+        response.set_etag(digest)
+        response.headers['Cache-Control'] = plot_cache.cache_control_for(date)
+        return response.make_conditional(request)
         
-        return jsonify({'image': f'data:image/png;base64,{img_base64}'})
+    except RenderPoolBusy as e:
+        print(f"Plot renderer busy: {e}")
+        response = jsonify({'error': str(e)})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response
         
     except Exception as e:
         print(f"Error generating plot: {e}")
@@ -453,6 +386,9 @@ def generate_plot(catcher_id, game_pk):
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
-  import os
-port = int(os.environ.get('PORT', 5000))
-app.run(debug=True, port=port, host='0.0.0.0')
\ No newline at end of file
+    # Development server only; production runs under gunicorn (see gunicorn.conf.py)
+    port = int(os.environ.get('PORT', 5000))
+    # The reloader runs this file twice; only its serving process renders plots
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        get_render_pool()
+    app.run(debug=True, port=port, host='0.0.0.0')
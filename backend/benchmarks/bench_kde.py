@@ -0,0 +1,109 @@
+"""Benchmark: seaborn kdeplot(levels=100) vs. the binned KDE raster (density.py).
+
+Run from the backend directory:
+
+    python benchmarks/bench_kde.py
+
+For each plot size it times the heatmap layer alone (drawn and saved on an
+otherwise empty figure) and the full shadow-zone PNG both ways, and reports
+PNG size and how far the binned density is from the exact Gaussian KDE seaborn
+evaluates (max absolute error as a share of the peak).
+"""
+import os
+import sys
+import io
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import seaborn as sns  # noqa: E402
+from scipy.stats import gaussian_kde  # noqa: E402
+
+import density  # noqa: E402
+import plotting  # noqa: E402
+from synthetic import synthetic_statcast  # noqa: E402
+from zones import is_in_shadow_zone  # noqa: E402
+
+# Rows handed to the plot: one game, a series-sized sample, a month of one catcher
+PLOT_ROWS = {'game': 150, 'series': 1500, 'month': 15000}
+
+
+@contextmanager
+def legacy_kde():
+    """Swap the original seaborn kdeplot call back into plotting.py"""
+    def seaborn_density(x, z):
+        return x, z
+
+    def seaborn_draw(ax, coords, cmap='inferno', alpha=0.5, thresh=0.05):
+        x, z = coords
+        sns.kdeplot(x=x, y=z, fill=True, cmap=cmap, alpha=alpha, ax=ax, levels=100, thresh=thresh, linewidths=0)
+
+    original = plotting.get_density, plotting.draw_density
+    plotting.get_density, plotting.draw_density = seaborn_density, seaborn_draw
+    try:
+        yield
+    finally:
+        plotting.get_density, plotting.draw_density = original
+
+
+def density_error(x, z):
+    """Max |binned - exact| over the grid, relative to the exact peak"""
+    # Cell centers, to line up with the histogram bins
+    half = density.CELL_SIZE / 2
+    zz = np.linspace(density.GRID_Z[0] + half, density.GRID_Z[1] - half, density.GRID_SHAPE[0])
+    xx = np.linspace(density.GRID_X[0] + half, density.GRID_X[1] - half, density.GRID_SHAPE[1])
+    gx, gz = np.meshgrid(xx, zz)
+    exact = gaussian_kde(np.vstack([x, z]))(np.vstack([gx.ravel(), gz.ravel()])).reshape(gx.shape)
+    binned = density.kde_grid(x, z)
+    return float(np.abs(binned - exact).max() / exact.max())
+
+
+def heatmap_only(x, z):
+    """Render just the heatmap layer, the way plotting.py lays out its axes"""
+    fig, ax = plotting._new_figure()
+    plotting.draw_density(ax, plotting.get_density(x, z), cmap='inferno', alpha=0.5, thresh=0.05)
+    ax.set_xlim(-1.5, 1.5)
+    ax.set_ylim(0.5, 4.5)
+    ax.set_aspect('equal', adjustable='datalim')
+    fig.savefig(io.BytesIO(), format='png', bbox_inches='tight', dpi=150)
+
+
+def _best_of(fn, repeat=3):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    source = synthetic_statcast(max(PLOT_ROWS.values()))
+    print(f"{'plot':<8}{'rows':>7}{'strikes':>9}{'layer: seaborn':>16}{'raster':>9}{'speedup':>9}"
+          f"{'plot: seaborn':>15}{'raster':>9}{'seaborn KB':>12}{'raster KB':>11}{'max err':>9}")
+    for name, n_rows in PLOT_ROWS.items():
+        df = source.iloc[:n_rows].reset_index(drop=True)
+        shadow = df[is_in_shadow_zone(df)]
+        strikes = shadow[shadow['description'] == 'called_strike']
+
+        x, z = strikes['plate_x'].to_numpy(), strikes['plate_z'].to_numpy()
+
+        with legacy_kde():
+            legacy_layer, _ = _best_of(lambda: heatmap_only(x, z))
+            legacy_time, legacy_png = _best_of(lambda: plotting.render_plot(df, 'Benchmark', '2025-04-01'))
+
+        raster_time, raster_png = _best_of(lambda: plotting.render_plot(df, 'Benchmark', '2025-04-01'))
+        raster_layer, _ = _best_of(lambda: heatmap_only(x, z))
+
+        error = density_error(x, z)
+        print(f"{name:<8}{n_rows:>7}{len(strikes):>9}{legacy_layer:>16.3f}{raster_layer:>9.3f}"
+              f"{legacy_layer / raster_layer:>8.1f}x{legacy_time:>15.3f}{raster_time:>9.3f}"
+              f"{len(legacy_png) / 1024:>12.0f}{len(raster_png) / 1024:>11.0f}{error:>9.1%}")
+    print("times in seconds, best of 3; raster times include computing the density")
+
+
+if __name__ == '__main__':
+    main()
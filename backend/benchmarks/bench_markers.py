@@ -0,0 +1,83 @@
+"""Benchmark: per-pitch patches (iterrows) vs. batched marker collections.
+
+Run from the backend directory:
+
+    python benchmarks/bench_markers.py
+
+Times the marker layer alone (artists built, then the figure saved as PNG) for
+increasing numbers of called pitches.
+"""
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from matplotlib.patches import Circle  # noqa: E402
+
+import plotting  # noqa: E402
+from synthetic import synthetic_statcast  # noqa: E402
+from zones import BALL_RADIUS, is_in_strike_zone  # noqa: E402
+
+PITCH_COUNTS = (30, 300, 3000, 10000)
+
+
+def legacy_markers(ax, called_df):
+    """The original one-artist-per-pitch loop from plotting.py, kept as the baseline"""
+    for _, row in called_df.iterrows():
+        color = plotting.PITCH_COLORS.get(row['pitch_type'], 'white')
+        linestyle = 'solid' if row['stand'] == 'R' else (0, (1, 1, 0, 1))
+        x, z = row['plate_x'], row['plate_z']
+        if row['description'] == 'called_strike':
+            ax.add_patch(Circle((x, z), BALL_RADIUS, edgecolor=color, facecolor=color, lw=1.5, linestyle=linestyle, alpha=0.8))
+            ax.add_patch(Circle((x, z), BALL_RADIUS, edgecolor='white', facecolor='none', lw=2.2, linestyle=linestyle))
+            if not row['true_strike']:
+                ax.text(x, z, '*', color='white', fontsize=12, weight='bold', ha='center', va='center')
+        else:
+            ax.plot(x, z, marker='x', color=color, markersize=13, mew=3, alpha=0.8)
+            if row['true_strike']:
+                ax.text(x, z, '*', color='white', fontsize=12, weight='bold', ha='center', va='center')
+
+
+def batched_markers(ax, called_df):
+    plotting._draw_pitch_markers(ax, called_df, called_df['true_strike'].to_numpy())
+
+
+def render_layer(draw, called_df):
+    fig, ax = plotting._new_figure()
+    draw(ax, called_df)
+    ax.set_xlim(-1.5, 1.5)
+    ax.set_ylim(0.5, 4.5)
+    ax.set_aspect('equal', adjustable='datalim')
+    fig.savefig(io.BytesIO(), format='png', bbox_inches='tight', dpi=150)
+    return len(ax.get_children())
+
+
+def _best_of(fn, repeat=3):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    source = synthetic_statcast(max(PITCH_COUNTS) * 3)
+    called = source[source['description'].isin(['called_strike', 'ball'])].reset_index(drop=True)
+    called['true_strike'] = is_in_strike_zone(called)
+
+    print(f"{'pitches':>8}{'patches (s)':>13}{'artists':>9}{'collections (s)':>17}{'artists':>9}{'speedup':>9}")
+    for n in PITCH_COUNTS:
+        called_df = called.iloc[:n]
+        repeat = 1 if n > 1000 else 3
+        legacy_time, legacy_artists = _best_of(lambda: render_layer(legacy_markers, called_df), repeat)
+        batched_time, batched_artists = _best_of(lambda: render_layer(batched_markers, called_df))
+        print(f"{n:>8}{legacy_time:>13.3f}{legacy_artists:>9}{batched_time:>17.3f}{batched_artists:>9}"
+              f"{legacy_time / batched_time:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
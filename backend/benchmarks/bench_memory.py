@@ -0,0 +1,155 @@
+"""Benchmark: peak RSS of a catcher-list + plot request, wide pull vs. compact day.
+
+Run from the backend directory:
+
+    python benchmarks/bench_memory.py
+
+Each variant runs in a fresh interpreter so peaks don't leak between them. The
+reported number is how far the peak RSS (VmHWM, reset after warm-up; Linux
+only) rose above the warmed-up RSS (imports done, one plot already rendered):
+
+    legacy   the original flow: a full-width pybaseball-shaped frame per
+             request, with the .copy()s get_catchers(), generate_plot() and
+             the plot function used to make
+    ingest   one-time cost of projecting and downcasting a pull for the cache
+    compact  the current flow: the cached day read back from Parquet, filtered
+             without copies
+"""
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import SCALES, synthetic_statcast, widen_like_pybaseball  # noqa: E402
+
+VARIANTS = ['legacy', 'ingest', 'compact']
+BENCH_SCALES = ['day', 'month']
+
+
+def _status_mb(field):
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError(f"{field} not found in /proc/self/status")
+
+
+def _reset_peak():
+    # Writing 5 to clear_refs resets VmHWM to the current RSS
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')
+
+
+def _first_game(games):
+    first = games.iloc[0]
+    return int(first['catcher_id']), int(first['game_pk'])
+
+
+def run_legacy(n_rows):
+    from aggregation import aggregate_catcher_games, called_pitch_mask
+    from plotting import render_plot
+    from zones import is_in_shadow_zone, is_in_strike_zone
+
+    raw = widen_like_pybaseball(synthetic_statcast(n_rows))
+    called = raw[called_pitch_mask(raw)].copy()
+    catcher_id, game_pk = _first_game(aggregate_catcher_games(called))
+    catcher_data = raw[(raw['fielder_2'] == catcher_id) & (raw['game_pk'] == game_pk) & called_pitch_mask(raw)].copy()
+    # The two copies the plot function used to make before drawing
+    shadow = catcher_data[is_in_shadow_zone(catcher_data)].copy()
+    shadow['true_strike'] = is_in_strike_zone(shadow)
+    called_shadow = shadow[shadow['description'].isin(['called_strike', 'ball'])].copy()
+    render_plot(catcher_data, 'Benchmark', '2025-04-01')
+    return len(raw), len(called_shadow)
+
+
+def run_ingest(n_rows, path):
+    from statcast_cache import compact_types, project_columns
+
+    raw = widen_like_pybaseball(synthetic_statcast(n_rows))
+    day = compact_types(project_columns(raw))
+    del raw
+    day.to_parquet(path, index=False)
+    return len(day), int(day.memory_usage(deep=True).sum())
+
+
+def run_compact(path):
+    import pandas as pd
+
+    from aggregation import aggregate_catcher_games, called_pitch_mask
+    from plotting import render_plot
+
+    day = pd.read_parquet(path)
+    catcher_id, game_pk = _first_game(aggregate_catcher_games(day))
+    catcher_data = day[(day['fielder_2'] == catcher_id) & (day['game_pk'] == game_pk) & called_pitch_mask(day)]
+    render_plot(catcher_data, 'Benchmark', '2025-04-01')
+    return len(day), len(catcher_data)
+
+
+def child(variant, n_rows, path):
+    import pandas as pd
+    from plotting import render_plot
+
+    # Warm up: imports, fonts and the Agg canvas are paid for before measuring
+    render_plot(pd.DataFrame(columns=['plate_x', 'plate_z', 'sz_top', 'sz_bot']), '', '')
+    gc.collect()
+    _reset_peak()
+    baseline = _status_mb('VmRSS')
+    if variant == 'legacy':
+        run_legacy(n_rows)
+    elif variant == 'ingest':
+        run_ingest(n_rows, path)
+    else:
+        run_compact(path)
+    print(json.dumps({'baseline_mb': baseline, 'peak_mb': _status_mb('VmHWM')}))
+
+
+def frame_sizes(n_rows):
+    """In-memory size (MB) of the wide pull and of the compact cached day"""
+    from statcast_cache import compact_types, project_columns
+
+    raw = widen_like_pybaseball(synthetic_statcast(n_rows))
+    projected = project_columns(raw)
+    wide_mb = raw.memory_usage(deep=True).sum() / 1e6
+    del raw
+    compact_mb = compact_types(projected).memory_usage(deep=True).sum() / 1e6
+    return wide_mb, compact_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--child', choices=VARIANTS, help=argparse.SUPPRESS)
+    parser.add_argument('--rows', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.rows, args.path)
+        return
+
+    print(f"{'scale':<8}{'rows':>9}{'wide MB':>10}{'compact MB':>12}"
+          + ''.join(f"{variant + ' peak +MB':>20}" for variant in VARIANTS))
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in BENCH_SCALES:
+            n_rows = SCALES[scale]
+            path = os.path.join(tmp, f'{scale}.parquet')
+            wide_mb, compact_mb = frame_sizes(n_rows)
+            deltas = []
+            # ingest runs before compact so the Parquet file exists
+            for variant in VARIANTS:
+                out = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), '--child', variant, '--rows', str(n_rows), '--path', path],
+                    check=True, capture_output=True, text=True,
+                ).stdout
+                result = json.loads(out.strip().splitlines()[-1])
+                deltas.append(result['peak_mb'] - result['baseline_mb'])
+            print(f"{scale:<8}{n_rows:>9}{wide_mb:>10.1f}{compact_mb:>12.2f}"
+                  + ''.join(f"{delta:>20.1f}" for delta in deltas))
+
+
+if __name__ == '__main__':
+    main()
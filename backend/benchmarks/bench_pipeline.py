@@ -0,0 +1,247 @@
+"""Benchmark: every stage of a catcher-list + plot request, as machine-readable JSON.
+
+Run from the backend directory:
+
+    python benchmarks/bench_pipeline.py                      # day, month, season
+    python benchmarks/bench_pipeline.py --scales day month --compare benchmarks/results/abc1234.json
+
+Each scale is a synthetic Statcast frame (synthetic.py) in the
+compact shape the day cache stores, so nothing touches the network: player
+names come from a throwaway SQLite directory seeded with the synthetic ids.
+Stages:
+
+    zone_classification  zone codes and rulebook box for every pitch
+    aggregation          aggregate_catcher_games(), one row per catcher-game
+    team_resolution      fielding team for every called pitch
+    name_resolution      bulk id -> name lookup from the player directory
+    payload              /api/statcast/catchers records serialized to JSON
+    kde                  binned KDE of the busiest catcher's shadow-zone strikes
+    plot_build           the shadow-zone figure for that catcher (markers or hexbin)
+    render               Agg rasterization of the figure at 150 dpi
+    png_encode           PNG encoding of the rasterized pixels
+    render_plot          render_plot() end to end, as the render pool runs it
+
+Each stage reports the best and median wall time over --repeat runs, and the
+peak Python/NumPy allocation during one extra traced run (tracemalloc; the
+Agg renderer's own C++ buffers aren't traced). Results are written to
+benchmarks/results/<commit>.json unless --output is given.
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep the player directory out of the real cache; must be set before players is imported
+os.environ['PLAYER_DB_PATH'] = os.path.join(tempfile.mkdtemp(prefix='bench-players-'), 'players.sqlite3')
+
+import matplotlib  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from PIL import Image  # noqa: E402
+
+import density  # noqa: E402
+import players  # noqa: E402
+import summaries  # noqa: E402
+from aggregation import aggregate_catcher_games, called_pitch_mask, fielding_team, to_catcher_records  # noqa: E402
+from plotting import plot_gameday_summary_inferno_shadow_only, render_plot  # noqa: E402
+from statcast_cache import compact_types, project_columns  # noqa: E402
+from synthetic import SCALES, synthetic_statcast  # noqa: E402
+from zones import is_in_shadow_zone, is_in_strike_zone, zone_codes  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+RENDER_DPI = 150
+
+# The plot's equal-aspect axes log a warning on every draw
+logging.getLogger('matplotlib').setLevel(logging.ERROR)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def environment():
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'matplotlib': matplotlib.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def fixture(scale, seed=0):
+    """A synthetic frame of the given scale, projected and downcast like a cached day"""
+    return compact_types(project_columns(synthetic_statcast(SCALES[scale], seed=seed)))
+
+
+def seed_player_directory(catcher_ids):
+    conn = players._connect()
+    try:
+        players._store(conn, {int(i): f"Catcher {int(i)}" for i in catcher_ids}, 'bench')
+    finally:
+        conn.close()
+
+
+def measure(fn, setup=None, repeat=3):
+    """Best/median seconds over repeat runs plus traced peak MB of one more run"""
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'best_s': round(min(times), 6),
+        'median_s': round(statistics.median(times), 6),
+        'peak_mb': round(peak / 1e6, 3),
+        'repeat': repeat,
+    }
+
+
+def rasterize(fig):
+    canvas = FigureCanvasAgg(fig)
+    fig.set_dpi(RENDER_DPI)
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba())
+
+
+def encode_png(pixels):
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def run_scale(scale, repeat):
+    data = fixture(scale)
+    called = data[called_pitch_mask(data)]
+    games = aggregate_catcher_games(data)
+    catcher_ids = games['catcher_id'].unique()
+    seed_player_directory(catcher_ids)
+
+    # The plot input: the busiest catcher's called pitches across the whole frame
+    busiest = called['fielder_2'].value_counts().index[0]
+    catcher_pitches = called[called['fielder_2'] == busiest]
+    shadow = catcher_pitches[is_in_shadow_zone(catcher_pitches)]
+    strikes = shadow[shadow['description'] == 'called_strike']
+    strike_x, strike_z = strikes['plate_x'].to_numpy(), strikes['plate_z'].to_numpy()
+    names = players.get_player_names(catcher_ids)
+
+    def zone_classification():
+        zone_codes(data)
+        is_in_strike_zone(data)
+
+    def name_resolution():
+        players.get_player_names(catcher_ids)
+
+    def payload():
+        summaries.serialize(to_catcher_records(games, names, date='2025-04-01'))
+
+    def build_figure():
+        return plot_gameday_summary_inferno_shadow_only(catcher_pitches, 'Benchmark', scale)
+
+    # Rasterization is timed on a freshly built figure each run
+    built = {}
+
+    def rebuild_figure():
+        built['figure'] = build_figure()
+
+    pixels = rasterize(build_figure())
+    png = encode_png(pixels)
+
+    stages = {
+        'zone_classification': (zone_classification, None),
+        'aggregation': (lambda: aggregate_catcher_games(data), None),
+        'team_resolution': (lambda: fielding_team(called), None),
+        # In-process names cleared each run, so this is the SQLite directory lookup
+        'name_resolution': (name_resolution, players._names.clear),
+        'payload': (payload, None),
+        'kde': (lambda: density.get_density(strike_x, strike_z), None),
+        'plot_build': (build_figure, None),
+        'render': (lambda: rasterize(built['figure']), rebuild_figure),
+        'png_encode': (lambda: encode_png(pixels), None),
+        'render_plot': (lambda: render_plot(catcher_pitches, 'Benchmark', scale), None),
+    }
+    results = {stage: measure(fn, setup, repeat) for stage, (fn, setup) in stages.items()}
+
+    return {
+        'rows': len(data),
+        'called_pitches': len(called),
+        'catcher_games': len(games),
+        'plot_pitches': len(catcher_pitches),
+        'kde_pitches': len(strikes),
+        'png_kb': round(len(png) / 1024, 1),
+        'stages': results,
+    }
+
+
+def print_table(results, baseline=None):
+    header = f"{'scale':<8}{'stage':<21}{'best ms':>10}{'median ms':>11}{'peak MB':>9}"
+    print(header + (f"{'vs base':>9}" if baseline else ''))
+    for scale, result in results.items():
+        for stage, numbers in result['stages'].items():
+            line = (f"{scale:<8}{stage:<21}{numbers['best_s'] * 1000:>10.2f}"
+                    f"{numbers['median_s'] * 1000:>11.2f}{numbers['peak_mb']:>9.2f}")
+            base = (baseline or {}).get(scale, {}).get('stages', {}).get(stage)
+            if base and base['best_s'] > 0:
+                line += f"{numbers['best_s'] / base['best_s']:>8.2f}x"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=list(SCALES))
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per stage")
+    parser.add_argument('--output', help="JSON output path (default: benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', help="Earlier JSON output to show best-time ratios against")
+    args = parser.parse_args()
+
+    results = {}
+    for scale in args.scales:
+        print(f"Benchmarking {scale} ({SCALES[scale]} rows)...")
+        results[scale] = run_scale(scale, args.repeat)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+    print_table(results, baseline)
+
+    meta = environment()
+    output = args.output or os.path.join(RESULTS_DIR, f"{meta['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({'environment': meta, 'results': results}, f, indent=2)
+    print(f"Wrote {output}")
+
+
+if __name__ == '__main__':
+    main()
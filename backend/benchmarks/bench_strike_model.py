@@ -0,0 +1,56 @@
+"""Benchmark: fitting and scoring the called-strike probability grid.
+
+Run from the backend directory:
+
+    python benchmarks/bench_strike_model.py
+
+Scoring is compared with a per-pitch lookup (one Python call per called pitch,
+the shape a model.predict-style scorer would have), timed on up to
+LOOP_SAMPLE_ROWS pitches and scaled linearly beyond that.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aggregation import called_pitch_mask  # noqa: E402
+from statcast_cache import compact_types, project_columns  # noqa: E402
+from strike_model import count_called, fit_grid, grid_indices, score_catcher_games  # noqa: E402
+from synthetic import SCALES, synthetic_statcast  # noqa: E402
+
+LOOP_SAMPLE_ROWS = 20000
+
+
+def per_pitch_probabilities(called, grid):
+    """One lookup call per pitch, kept as the baseline"""
+    flat = grid.ravel()
+    return [float(flat[grid_indices(called.iloc[[i]])[0]]) for i in range(len(called))]
+
+
+def best_of(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    print(f"{'scale':<8}{'called':>9}{'fit s':>9}{'score s':>10}{'per-pitch s':>13}{'speedup':>9}")
+    for scale, n_rows in SCALES.items():
+        data = compact_types(project_columns(synthetic_statcast(n_rows)))
+        called = data[called_pitch_mask(data)]
+
+        fit_s = best_of(lambda: fit_grid(*count_called(data)))
+        grid = fit_grid(*count_called(data))
+        score_s = best_of(lambda: score_catcher_games(data, grid))
+
+        sample = called.iloc[:LOOP_SAMPLE_ROWS]
+        loop_s = best_of(lambda: per_pitch_probabilities(sample, grid), repeat=1) * len(called) / len(sample)
+        print(f"{scale:<8}{len(called):>9}{fit_s:>9.3f}{score_s:>10.3f}{loop_s:>13.1f}{loop_s / score_s:>8.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark: row-wise DataFrame.apply vs. vectorized zone classification.
+
+Run from the backend directory:
+
+    python benchmarks/bench_zones.py
+
+The row-wise path is only timed on up to APPLY_SAMPLE_ROWS rows and scaled
+linearly beyond that, since a full season through ``apply`` takes minutes.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import SCALES, synthetic_statcast  # noqa: E402
+from zones import classify_zones, is_in_shadow_zone  # noqa: E402
+
+APPLY_SAMPLE_ROWS = 20000
+
+
+def legacy_is_in_shadow_zone(row):
+    """The original per-row classifier from app.py, kept as the baseline"""
+    x = row['plate_x']
+    z = row['plate_z']
+    sz_top = row['sz_top']
+    sz_bot = row['sz_bot']
+
+    # Expanded shadow zone margins
+    horizontal_margin = 0.3   # About 3.6 inches
+    vertical_margin = 0.4     # About 4.8 inches - bigger for top/bottom
+    edge_margin = 0.2         # Borderline inside zone
+
+    # Horizontal shadow zones (left and right of plate)
+    in_horizontal_shadow = (
+        # Right shadow (attack zone 12, 13, 14)
+        ((x > 0.7083) & (x <= 0.7083 + horizontal_margin) & (z >= sz_bot - vertical_margin) & (z <= sz_top + vertical_margin)) |
+        # Left shadow (attack zone 11, 16, 17)
+        ((x < -0.7083) & (x >= -0.7083 - horizontal_margin) & (z >= sz_bot - vertical_margin) & (z <= sz_top + vertical_margin))
+    )
+
+    # Vertical shadow zones (above and below strike zone) - EXPANDED
+    in_vertical_shadow = (
+        # Upper shadow (attack zone 18, 19) - bigger margin
+        ((z > sz_top) & (z <= sz_top + vertical_margin) & (x >= -0.7083 - horizontal_margin) & (x <= 0.7083 + horizontal_margin)) |
+        # Lower shadow - bigger margin
+        ((z < sz_bot) & (z >= sz_bot - vertical_margin) & (x >= -0.7083 - horizontal_margin) & (x <= 0.7083 + horizontal_margin))
+    )
+
+    # Borderline inside zone (edges of zones 1, 2, 3, 4, 6, 7, 8, 9) - slightly expanded
+    barely_in_zone = (
+        # Right edge of zone
+        ((x > 0.7083 - edge_margin) & (x <= 0.7083) & (z >= sz_bot) & (z <= sz_top)) |
+        # Left edge of zone
+        ((x < -0.7083 + edge_margin) & (x >= -0.7083) & (z >= sz_bot) & (z <= sz_top)) |
+        # Top edge of zone - expanded
+        ((z > sz_top - edge_margin) & (z <= sz_top) & (x >= -0.7083) & (x <= 0.7083)) |
+        # Bottom edge of zone - expanded
+        ((z < sz_bot + edge_margin) & (z >= sz_bot) & (x >= -0.7083) & (x <= 0.7083))
+    )
+
+    return in_horizontal_shadow | in_vertical_shadow | barely_in_zone
+
+
+def _best_of(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"{'scale':<8}{'rows':>10}{'apply (s)':>14}{'vectorized (s)':>17}{'labels (s)':>13}{'speedup':>10}")
+    for scale, n_rows in SCALES.items():
+        df = synthetic_statcast(n_rows)
+        sample = df.iloc[:APPLY_SAMPLE_ROWS]
+        apply_time = _best_of(lambda: sample.apply(legacy_is_in_shadow_zone, axis=1), repeat=1)
+        apply_time *= len(df) / len(sample)
+        vector_time = _best_of(lambda: is_in_shadow_zone(df))
+        label_time = _best_of(lambda: classify_zones(df))
+        marker = '*' if len(df) > len(sample) else ' '
+        print(f"{scale:<8}{len(df):>10}{apply_time:>13.3f}{marker}{vector_time:>17.4f}{label_time:>13.4f}"
+              f"{apply_time / vector_time:>9.0f}x")
+    print(f"* extrapolated from {APPLY_SAMPLE_ROWS} rows")
+
+
+if __name__ == '__main__':
+    main()
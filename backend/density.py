@@ -0,0 +1,91 @@
+"""Called-strike density heatmaps on a fixed plate grid.
+
+Replaces seaborn's kdeplot (an exact Gaussian KDE evaluated point by point,
+then 100 filled contour polygons) with a binned KDE: pitches are counted into
+a fixed grid in plate coordinates and smoothed with a separable Gaussian
+filter using the same Scott's-rule bandwidth seaborn picks. The result is
+drawn as a single imshow raster.
+
+Grids aren't cached: a grid takes a few milliseconds to compute, and repeat
+renders of the same plot are already served from the plot cache
+(plot_cache.py).
+"""
+import numpy as np
+from scipy.ndimage import gaussian_filter
+
+from metrics import timed
+
+# Plate coordinates in feet; wide enough for every shadow-zone pitch plus the
+# kernel tails, and for the whole visible plot area
+GRID_X = (-2.5, 2.5)
+GRID_Z = (0.0, 5.5)
+CELL_SIZE = 0.02
+
+# Matches kdeplot(thresh=0.05): the lowest-density 5% of the mass is left blank
+DEFAULT_THRESH = 0.05
+
+# Bandwidth used when there are too few pitches to estimate a spread
+FALLBACK_BANDWIDTH = 0.15
+
+GRID_SHAPE = (
+    int(round((GRID_Z[1] - GRID_Z[0]) / CELL_SIZE)),
+    int(round((GRID_X[1] - GRID_X[0]) / CELL_SIZE)),
+)
+EXTENT = (GRID_X[0], GRID_X[1], GRID_Z[0], GRID_Z[1])
+
+def scott_bandwidths(x, z):
+    """Per-axis kernel widths (feet) from Scott's rule, as in scipy/seaborn"""
+    n = len(x)
+    if n < 2:
+        return FALLBACK_BANDWIDTH, FALLBACK_BANDWIDTH
+    factor = n ** (-1.0 / 6)
+    bw_x = np.std(x, ddof=1) * factor
+    bw_z = np.std(z, ddof=1) * factor
+    return (bw_x if bw_x > 0 else FALLBACK_BANDWIDTH), (bw_z if bw_z > 0 else FALLBACK_BANDWIDTH)
+
+
+def kde_grid(x, z):
+    """Binned Gaussian KDE of (x, z) as a float32 array of shape GRID_SHAPE (rows are z)"""
+    x = np.asarray(x, dtype=np.float64)
+    z = np.asarray(z, dtype=np.float64)
+    valid = np.isfinite(x) & np.isfinite(z)
+    x, z = x[valid], z[valid]
+    if len(x) == 0:
+        return None
+
+    counts, _, _ = np.histogram2d(z, x, bins=GRID_SHAPE, range=[GRID_Z, GRID_X])
+    bw_x, bw_z = scott_bandwidths(x, z)
+    density = gaussian_filter(counts, sigma=(bw_z / CELL_SIZE, bw_x / CELL_SIZE), mode='constant')
+    density /= len(x) * CELL_SIZE * CELL_SIZE
+    return density.astype(np.float32)
+
+
+def get_density(x, z):
+    """kde_grid(x, z), timed under the 'density' stage"""
+    with timed('density'):
+        return kde_grid(x, z)
+
+
+def iso_proportion_level(density, thresh=DEFAULT_THRESH):
+    """Density value below which `thresh` of the total mass lies (seaborn's thresh)"""
+    values = np.sort(density, axis=None)
+    mass = np.cumsum(values)
+    if mass[-1] <= 0:
+        return np.inf
+    return values[np.searchsorted(mass, thresh * mass[-1])]
+
+
+def draw_density(ax, density, cmap='inferno', alpha=0.5, thresh=DEFAULT_THRESH):
+    """Draw a kde_grid result onto ax as one raster image"""
+    if density is None:
+        return None
+    level = iso_proportion_level(density, thresh)
+    peak = float(density.max())
+    if not np.isfinite(level) or peak <= 0:
+        return None
+    return ax.imshow(
+        np.ma.masked_less(density, level), extent=EXTENT, origin='lower',
+        cmap=cmap, alpha=alpha, vmin=level, vmax=peak,
+        interpolation='nearest', aspect='auto', zorder=0,
+    )
+
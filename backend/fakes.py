@@ -0,0 +1,104 @@
+"""Local stand-ins for the remote services the backend talks to.
+
+Run the fake MLB Stats API with:
+
+    python fakes.py people --port 5055
+
+and start the backend with ``MLB_STATSAPI_URL=http://localhost:5055/api/v1``.
+It also answers /schedule, reporting every slate before today as final.
+
+Set ``STATCAST_SOURCE=fake`` to replace Baseball Savant with fake_statcast(),
+which generates a deterministic slate for every in-season date. Its latency
+and failure rate can be set with FAKE_STATCAST_LATENCY (seconds) and
+FAKE_STATCAST_FAILURE_RATE (0-1) to exercise ingest.py's retries offline.
+
+The tests (``python -m pytest tests``) run on top of both.
+"""
+import argparse
+import os
+import random
+import time
+from datetime import date as date_cls, timedelta
+
+import pandas as pd
+from flask import Flask, jsonify, request
+
+from synthetic import GAMES_PER_DAY, PITCHES_PER_GAME, synthetic_statcast, widen_like_pybaseball
+
+FAKE_STATCAST_LATENCY = float(os.environ.get('FAKE_STATCAST_LATENCY', 0))
+FAKE_STATCAST_FAILURE_RATE = float(os.environ.get('FAKE_STATCAST_FAILURE_RATE', 0))
+# Months with regular-season or postseason games
+SEASON_MONTHS = range(3, 11)
+
+SAMPLE_PEOPLE = {
+    592663: 'J.T. Realmuto',
+    669257: 'Will Smith',
+    668939: 'Adley Rutschman',
+    663728: 'Cal Raleigh',
+    672275: 'Patrick Bailey',
+}
+
+
+def people_app(people=None):
+    """Flask app mimicking /api/v1/people, /api/v1/people/<id> and /api/v1/schedule"""
+    people = SAMPLE_PEOPLE if people is None else people
+    fake = Flask(__name__)
+
+    def _person(player_id):
+        return {'id': player_id, 'fullName': people[player_id]}
+
+    @fake.route('/api/v1/people')
+    def people_batch():
+        ids = [int(i) for i in request.args.get('personIds', '').split(',') if i.strip()]
+        return jsonify({'people': [_person(i) for i in ids if i in people]})
+
+    @fake.route('/api/v1/people/<int:player_id>')
+    def people_single(player_id):
+        if player_id not in people:
+            return jsonify({'people': []}), 404
+        return jsonify({'people': [_person(player_id)]})
+
+    @fake.route('/api/v1/schedule')
+    def schedule():
+        date = request.args.get('date', date_cls.today().isoformat())
+        state = 'Final' if date < date_cls.today().isoformat() else 'Live'
+        return jsonify({'dates': [{'date': date, 'games': [{'status': {'abstractGameState': state}}]}]})
+
+    return fake
+
+
+def fake_statcast(start_dt, end_dt=None, **kwargs):
+    """Offline pybaseball.statcast(): the same full-width pitches for a date every time"""
+    if FAKE_STATCAST_LATENCY:
+        time.sleep(FAKE_STATCAST_LATENCY)
+    if random.random() < FAKE_STATCAST_FAILURE_RATE:
+        raise ConnectionError("Fake Statcast source failed (FAKE_STATCAST_FAILURE_RATE)")
+
+    day = date_cls.fromisoformat(start_dt)
+    last = date_cls.fromisoformat(end_dt or start_dt)
+    frames = []
+    while day <= last:
+        if day.month in SEASON_MONTHS:
+            pitches = synthetic_statcast(PITCHES_PER_GAME * GAMES_PER_DAY, start_date=day.isoformat(),
+                                         seed=day.toordinal())
+            # Distinct game_pks per date, like real ones
+            pitches['game_pk'] += (day.toordinal() % 100000) * GAMES_PER_DAY
+            frames.append(widen_like_pybaseball(pitches, seed=day.toordinal()))
+        day += timedelta(days=1)
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('service', choices=['people'])
+    parser.add_argument('--port', type=int, default=5055)
+    args = parser.parse_args()
+
+    if args.service == 'people':
+        people_app().run(port=args.port)
+
+
+if __name__ == '__main__':
+    main()
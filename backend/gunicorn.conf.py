@@ -0,0 +1,54 @@
+"""Production server settings (gunicorn --config gunicorn.conf.py app:app).
+
+Each worker process serves requests on a pool of threads. Requests mostly
+wait on Savant downloads, SQLite or the render pool, so threads keep a worker
+responsive while one request is blocked. Plot rendering itself runs in the
+render pool's own processes (render_pool.py), one pool per worker.
+
+The master also runs the precompute worker (worker.py --watch --render-plots)
+as a child process, so it writes summaries, rollups, plots and Statcast days
+into the same .cache directory the web workers read. To run it as a separate
+service instead, set RUN_WORKER=0 here and point SUMMARY_DIR,
+STATCAST_CACHE_DIR, ROLLUP_DB_PATH, PLOT_CACHE_DIR, PLAYER_DB_PATH and
+STRIKE_MODEL_DIR at a volume both services mount.
+"""
+import os
+import subprocess
+import sys
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+# A cold day can spend most of a minute downloading from Savant
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = '-'
+
+RUN_WORKER = os.environ.get('RUN_WORKER', '1') == '1'
+_worker_process = None
+
+
+def post_worker_init(worker):
+    # Start the worker's render processes before it takes requests
+    from render_pool import get_render_pool
+    get_render_pool()
+
+
+def when_ready(server):
+    global _worker_process
+    if RUN_WORKER:
+        print("Starting precompute worker")
+        _worker_process = subprocess.Popen(
+            [sys.executable, 'worker.py', '--watch', '--render-plots'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+
+
+def on_exit(server):
+    if _worker_process is not None:
+        _worker_process.terminate()
+        _worker_process.wait(timeout=graceful_timeout)
@@ -0,0 +1,101 @@
+"""Bulk Statcast backfill into the local day cache.
+
+A date range is split into single days, which are fetched concurrently (a few
+at a time) through the same fetch path the API uses (statcast_cache.py). Each
+finished day is written atomically to its own Parquet file, so an interrupted
+or partly failed run resumes where it stopped: days already stored are skipped
+on the next run. Failed days are retried with backoff and reported at the end.
+
+    python ingest.py 2025-03-27 2025-09-28 --workers 6
+    STATCAST_SOURCE=fake python ingest.py 2025-04-01 2025-04-30   # offline
+
+By default the per-catcher rollups (rollups.py) and each season's called-strike
+grid (strike_model.py) are updated afterwards so the leaderboards and range
+plots can use the new days straight away.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+from rollups import completed_dates, ensure_ingested
+from statcast_cache import is_day_stored, store_day
+from strike_model import refit_season_grid
+
+# Savant rate-limits aggressive clients; a handful of parallel pulls is plenty
+INGEST_WORKERS = int(os.environ.get('INGEST_WORKERS', 4))
+FETCH_ATTEMPTS = 3
+RETRY_BACKOFF_SECONDS = 2
+
+
+def fetch_day(date, attempts=FETCH_ATTEMPTS, backoff=RETRY_BACKOFF_SECONDS):
+    """store_day() with retries; returns the row count or raises the last error"""
+    for attempt in range(1, attempts + 1):
+        try:
+            return store_day(date)
+        except Exception as e:
+            if attempt == attempts:
+                raise
+            delay = backoff * 2 ** (attempt - 1)
+            print(f"Fetching {date} failed ({e}); retrying in {delay}s")
+            time.sleep(delay)
+
+
+def pending_days(start, end):
+    """Completed days in the range that aren't in the local store yet"""
+    return [date for date in completed_dates(start, end) if not is_day_stored(date)]
+
+
+def ingest_range(start, end, workers=INGEST_WORKERS):
+    """Fetch every missing day in [start, end]; returns (fetched, failed) date lists"""
+    days = pending_days(start, end)
+    total = len(completed_dates(start, end))
+    print(f"{total - len(days)}/{total} days already stored, fetching {len(days)} with {workers} workers")
+
+    fetched, failed = [], []
+    started = time.time()
+    executor = ThreadPoolExecutor(max_workers=max(workers, 1))
+    try:
+        futures = {executor.submit(fetch_day, date): date for date in days}
+        for future in as_completed(futures):
+            date = futures[future]
+            try:
+                rows = future.result()
+                fetched.append(date)
+                print(f"[{len(fetched) + len(failed)}/{len(days)}] {date}: {rows} pitches")
+            except Exception as e:
+                failed.append(date)
+                print(f"[{len(fetched) + len(failed)}/{len(days)}] {date}: failed ({e})")
+    finally:
+        # On Ctrl-C, drop queued days; finished days are already on disk
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    print(f"Fetched {len(fetched)} days in {time.time() - started:.1f}s, {len(failed)} failed")
+    return sorted(fetched), sorted(failed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill Statcast days into the local store")
+    parser.add_argument('start', help="First date (YYYY-MM-DD)")
+    parser.add_argument('end', nargs='?', default=(datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d'),
+                        help="Last date (YYYY-MM-DD), defaults to yesterday")
+    parser.add_argument('--workers', type=int, default=INGEST_WORKERS, help="Days fetched concurrently")
+    parser.add_argument('--no-rollups', action='store_true', help="Only fill the day cache (no rollups or grids)")
+    args = parser.parse_args()
+
+    _, failed = ingest_range(args.start, args.end, args.workers)
+    if failed:
+        # Rolling up would refetch the failed days serially; leave it to the rerun
+        print(f"Failed days (rerun to retry): {', '.join(failed)}")
+        sys.exit(1)
+    if not args.no_rollups:
+        missing = ensure_ingested(args.start, args.end)
+        print(f"Rolled up {len(missing)} new days")
+        for season in range(int(args.start[:4]), int(args.end[:4]) + 1):
+            refit_season_grid(season)
+
+
+if __name__ == '__main__':
+    main()
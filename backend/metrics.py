@@ -0,0 +1,150 @@
+"""In-process timing and cache metrics, exposed in Prometheus text format.
+
+Hot paths call ``timed(stage)`` / ``count_cache(cache, hit)`` / ``count_rows``
+and /api/metrics renders everything collected so far. Metrics are per process;
+with several server workers each one reports its own numbers.
+"""
+import cProfile
+import io
+import pstats
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+# Seconds; covers sub-millisecond cache hits through multi-second Savant pulls
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+PROFILE_TOP_N = 40
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets=DURATION_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self._series = {}  # labels tuple -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted(self._series.items())
+            for key, series in items:
+                for bound, count in zip(self.buckets, series):
+                    lines.append(f"{self.name}_bucket{_labels(key, le=_format(bound))} {count}")
+                lines.append(f"{self.name}_bucket{_labels(key, le='+Inf')} {series[-1]}")
+                lines.append(f"{self.name}_sum{_labels(key)} {series[-2]:.6f}")
+                lines.append(f"{self.name}_count{_labels(key)} {series[-1]}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._values = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] += amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(key)} {_format(value)}")
+        return lines
+
+
+def _format(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _labels(key, **extra):
+    pairs = list(key) + list(extra.items())
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+REQUEST_DURATION = Histogram('framing_request_duration_seconds', 'HTTP request latency by endpoint and status')
+STAGE_DURATION = Histogram('framing_stage_duration_seconds', 'Latency of individual backend stages')
+CACHE_REQUESTS = Counter('framing_cache_requests_total', 'Cache lookups by cache layer and result')
+ROWS_PROCESSED = Counter('framing_rows_processed_total', 'Rows handled by each stage')
+COALESCED_REQUESTS = Counter('framing_coalesced_requests_total', 'Calls that joined an identical in-flight computation')
+
+ALL_METRICS = [REQUEST_DURATION, STAGE_DURATION, CACHE_REQUESTS, ROWS_PROCESSED, COALESCED_REQUESTS]
+
+
+@contextmanager
+def timed(stage):
+    """Record how long the wrapped block takes under framing_stage_duration_seconds"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_DURATION.observe(time.perf_counter() - started, stage=stage)
+
+
+def count_cache(cache, hit):
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+def count_rows(stage, rows):
+    ROWS_PROCESSED.inc(rows, stage=stage)
+
+
+def render_metrics():
+    """All metrics in Prometheus text exposition format"""
+    lines = []
+    for metric in ALL_METRICS:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+def init_app(app, allow_profiling=False):
+    """Time every request, and let ?profile=1 return a cProfile summary instead of the body"""
+    from flask import Response, g, request
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_started = time.perf_counter()
+        if allow_profiling and request.args.get('profile') == '1':
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
+
+    @app.after_request
+    def _record_request(response):
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+        started = g.pop('metrics_started', None)
+        if started is not None:
+            REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                endpoint=request.endpoint or 'unknown',
+                status=response.status_code,
+            )
+        if profiler is not None:
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(PROFILE_TOP_N)
+            profiled = Response(out.getvalue(), mimetype='text/plain')
+            profiled.headers['X-Profiled-Status'] = str(response.status_code)
+            return profiled
+        return response
@@ -0,0 +1,49 @@
+"""Called pitches for one catcher across a date range, for range plots.
+
+The rollups table (rollups.py) says which days a catcher caught, so only those
+days are read from the local Statcast day cache. Each day is cut down to the
+catcher's called shadow-zone pitches and the handful of columns the plot draws
+before the next day is loaded, so memory holds one day of raw Statcast plus a
+compact frame of the kept pitches, even for a full season.
+"""
+import pandas as pd
+
+from aggregation import called_pitch_mask
+from metrics import count_rows, timed
+from rollups import REQUEST_FETCH_DAYS, catcher_dates, ensure_ingested
+from statcast_cache import get_statcast_day
+from zones import is_in_shadow_zone
+
+# Longest range a single plot may cover
+MAX_RANGE_DAYS = 366
+
+# Only what plotting.py reads (already float32/categorical in the day cache)
+PLOT_COLUMNS = ['plate_x', 'plate_z', 'sz_top', 'sz_bot', 'description', 'pitch_type', 'stand']
+CATEGORY_COLUMNS = ['description', 'pitch_type', 'stand']
+
+
+def iter_catcher_days(catcher_id, start, end):
+    """Yield (date, called shadow-zone pitches) for each day the catcher caught.
+
+    Raises rollups.DaysNotStored if the range needs a backfill first.
+    """
+    ensure_ingested(start, end, fetch_limit=REQUEST_FETCH_DAYS)
+    for date in catcher_dates(catcher_id, start, end):
+        data = get_statcast_day(date)
+        with timed('range_select'):
+            rows = data[(data['fielder_2'] == catcher_id) & called_pitch_mask(data)]
+            # The plot only ever draws shadow-zone pitches
+            rows = rows.loc[is_in_shadow_zone(rows), PLOT_COLUMNS]
+        count_rows('range_select', len(rows))
+        yield date, rows
+
+
+def load_catcher_pitches(catcher_id, start, end):
+    """All of the catcher's called shadow-zone pitches in [start, end] as one compact frame"""
+    frames = [rows for _, rows in iter_catcher_days(catcher_id, start, end) if not rows.empty]
+    if not frames:
+        return pd.DataFrame(columns=PLOT_COLUMNS)
+    pitches = pd.concat(frames, ignore_index=True)
+    # Days with different category sets concatenate to object; re-encode once
+    pitches[CATEGORY_COLUMNS] = pitches[CATEGORY_COLUMNS].astype('category')
+    return pitches
@@ -0,0 +1,213 @@
+"""Player id -> name directory.
+
+Names live in a small SQLite table next to the Statcast cache, seeded from the
+pybaseball Chadwick register (a single bulk download of every MLB player). The
+download is multi-MB, so it never runs inside a request: the worker refreshes
+it weekly (worker.py), or seed it by hand with
+
+    python players.py seed
+
+Lookups resolve a whole batch of ids with one query; only ids missing from the
+store fall back to one batched call to the MLB Stats API people endpoint over a
+pooled session.
+"""
+import argparse
+import os
+import sqlite3
+import threading
+import time
+
+import pybaseball as pyb
+import requests
+
+from metrics import count_cache, timed
+
+PLAYER_DB_PATH = os.environ.get(
+    'PLAYER_DB_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'players.sqlite3')
+)
+# Point this at a local stand-in (see fakes.py) to run without the network
+MLB_STATSAPI_URL = os.environ.get('MLB_STATSAPI_URL', 'https://statsapi.mlb.com/api/v1')
+REGISTER_REFRESH_SECONDS = 7 * 24 * 60 * 60
+PEOPLE_BATCH_SIZE = 100
+MISS_RETRY_SECONDS = 60 * 60
+
+_names = {}  # In-process copy of everything already resolved
+_misses = {}  # id -> time of the last failed lookup, so unknown ids aren't retried every request
+_register_attempted_at = 0
+_lock = threading.Lock()
+_session = None
+
+
+def _connect():
+    os.makedirs(os.path.dirname(PLAYER_DB_PATH), exist_ok=True)
+    conn = sqlite3.connect(PLAYER_DB_PATH, timeout=10)
+    conn.execute("CREATE TABLE IF NOT EXISTS players (id INTEGER PRIMARY KEY, name TEXT NOT NULL, source TEXT)")
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    return conn
+
+
+def _get_session():
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        _session.mount('https://', adapter)
+        _session.mount('http://', adapter)
+    return _session
+
+
+def _load_from_db(conn, ids):
+    found = {}
+    ids = list(ids)
+    # Stay well under SQLite's bound-parameter limit
+    for i in range(0, len(ids), 500):
+        chunk = ids[i:i + 500]
+        placeholders = ','.join('?' * len(chunk))
+        rows = conn.execute(f"SELECT id, name FROM players WHERE id IN ({placeholders})", chunk)
+        found.update(rows.fetchall())
+    return found
+
+
+def _store(conn, names, source):
+    conn.executemany(
+        "INSERT OR REPLACE INTO players (id, name, source) VALUES (?, ?, ?)",
+        [(player_id, name, source) for player_id, name in names.items()]
+    )
+    conn.commit()
+
+
+def _register_is_stale(conn):
+    row = conn.execute("SELECT value FROM meta WHERE key = 'register_loaded_at'").fetchone()
+    return row is None or time.time() - float(row[0]) > REGISTER_REFRESH_SECONDS
+
+
+def seed_from_register(conn=None):
+    """Bulk-load every MLB player from the Chadwick register into the store"""
+    own_conn = conn is None
+    conn = conn or _connect()
+    try:
+        print("Loading Chadwick register into player directory...")
+        register = pyb.chadwick_register()
+        register = register[register['key_mlbam'] > 0]
+        names = {
+            int(player_id): f"{first} {last}".strip()
+            for player_id, first, last in zip(
+                register['key_mlbam'], register['name_first'].fillna(''), register['name_last'].fillna('')
+            )
+        }
+        _store(conn, names, 'chadwick')
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('register_loaded_at', ?)", (str(time.time()),))
+        conn.commit()
+        print(f"Player directory seeded with {len(names)} players")
+        return len(names)
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def refresh_register(force=False):
+    """Seed from the register if it was never loaded or is over a week old; returns players loaded.
+
+    A failed download isn't retried for MISS_RETRY_SECONDS.
+    """
+    global _register_attempted_at
+    if not force and time.time() - _register_attempted_at < MISS_RETRY_SECONDS:
+        return 0
+    conn = _connect()
+    try:
+        if not force and not _register_is_stale(conn):
+            return 0
+        _register_attempted_at = time.time()
+        with timed('name_lookup_register'):
+            return seed_from_register(conn)
+    finally:
+        conn.close()
+
+
+def _fetch_people(ids):
+    """Resolve ids with the MLB people endpoint, batched (personIds=1,2,3)"""
+    names = {}
+    ids = list(ids)
+    session = _get_session()
+    for i in range(0, len(ids), PEOPLE_BATCH_SIZE):
+        chunk = ids[i:i + PEOPLE_BATCH_SIZE]
+        response = session.get(
+            f"{MLB_STATSAPI_URL}/people",
+            params={'personIds': ','.join(str(player_id) for player_id in chunk)},
+            timeout=5
+        )
+        if response.status_code != 200:
+            continue
+        for person in response.json().get('people', []):
+            if 'id' in person and 'fullName' in person:
+                names[int(person['id'])] = person['fullName']
+    return names
+
+
+def get_player_names(player_ids):
+    """Return {id: name} for every id, using "Player <id>" for unknown players"""
+    ids = {int(player_id) for player_id in player_ids}
+    result = {player_id: _names[player_id] for player_id in ids if player_id in _names}
+    now = time.time()
+    missing = {player_id for player_id in ids - result.keys() if now - _misses.get(player_id, 0) > MISS_RETRY_SECONDS}
+
+    count_cache('players', not missing)
+    if missing:
+        try:
+            conn = _connect()
+            try:
+                result.update(_load_from_db(conn, missing))
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Player directory unavailable: {e}")
+        missing -= result.keys()
+
+        if missing:
+            # No lock or connection is held across the HTTP call, so other
+            # requests' lookups never wait on it
+            try:
+                with timed('name_lookup_statsapi'):
+                    fetched = _fetch_people(missing)
+            except Exception as e:
+                print(f"Error fetching player names: {e}")
+                fetched = {}
+            if fetched:
+                try:
+                    conn = _connect()
+                    try:
+                        _store(conn, fetched, 'statsapi')
+                    finally:
+                        conn.close()
+                except sqlite3.Error as e:
+                    print(f"Player directory unavailable: {e}")
+            result.update(fetched)
+            with _lock:
+                for player_id in missing - fetched.keys():
+                    _misses[player_id] = now
+
+        with _lock:
+            _names.update(result)
+
+    for player_id in ids - result.keys():
+        result[player_id] = f"Player {player_id}"
+    return result
+
+
+def get_player_name(player_id):
+    """Get a single player's name"""
+    return get_player_names([player_id])[int(player_id)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the player name directory")
+    parser.add_argument('command', choices=['seed'])
+    args = parser.parse_args()
+
+    if args.command == 'seed':
+        refresh_register(force=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+"""Rendered plot cache.
+
+Finished games never change, so each rendered image is stored once on disk,
+content-addressed by its SHA-256 (which doubles as the HTTP ETag), and indexed
+by (catcher_id, game_pk, date, PLOT_VERSION). An in-memory LRU capped by bytes
+sits in front of the disk for hot images.
+
+Bumping plotting.PLOT_VERSION invalidates every cached image. To wipe the cache
+completely run:
+
+    python plot_cache.py clear
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+
+from metrics import count_cache
+from plotting import PLOT_VERSION
+from statcast_cache import is_day_final
+
+PLOT_CACHE_DIR = os.environ.get(
+    'PLOT_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'plots')
+)
+PLOT_MEMORY_CAP_BYTES = int(os.environ.get('PLOT_MEMORY_CAP_MB', 64)) * 1024 * 1024
+
+# Bump to drop every stored image without changing the rendering (2: images
+# cached from days whose Statcast pull wasn't final yet; 3: range plots cached
+# before every day in the range was rolled up)
+KEY_VERSION = 3
+
+# Final days: let browsers/CDNs reuse for a day, then revalidate with the ETag
+PAST_CACHE_CONTROL = 'public, max-age=86400'
+TODAY_CACHE_CONTROL = 'no-cache'
+
+
+class BytesLRU:
+    """Thread-safe LRU of (digest, bytes) bounded by total size"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, digest, data):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= len(old[1])
+            self._entries[key] = (digest, data)
+            self.total_bytes += len(data)
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.total_bytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+
+_memory = BytesLRU(PLOT_MEMORY_CAP_BYTES)
+
+
+def plot_key(catcher_id, game_pk, date, fmt='png'):
+    return f"v{PLOT_VERSION}.{KEY_VERSION}:{catcher_id}:{game_pk}:{date}:{fmt}"
+
+
+def is_final_date(date):
+    """Only plots of a day whose Statcast pull is final are cached (see statcast_cache.is_day_final)"""
+    return is_day_final(date)
+
+
+def cache_control_for(date, final=None):
+    """final overrides the day rule for plots spanning several days"""
+    if final is None:
+        final = is_final_date(date)
+    return PAST_CACHE_CONTROL if final else TODAY_CACHE_CONTROL
+
+
+def content_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _connect():
+    os.makedirs(PLOT_CACHE_DIR, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(PLOT_CACHE_DIR, 'index.sqlite3'), timeout=10)
+    conn.execute("CREATE TABLE IF NOT EXISTS refs (key TEXT PRIMARY KEY, digest TEXT NOT NULL, created_at REAL)")
+    return conn
+
+
+def _blob_path(digest, fmt):
+    return os.path.join(PLOT_CACHE_DIR, 'blobs', digest[:2], f"{digest}.{fmt}")
+
+
+def lookup_digest(key):
+    """Digest of the cached image for key (without loading it), or None"""
+    entry = _memory.get(key)
+    if entry is not None:
+        return entry[0]
+    conn = _connect()
+    try:
+        row = conn.execute("SELECT digest FROM refs WHERE key = ?", (key,)).fetchone()
+    finally:
+        conn.close()
+    return row[0] if row else None
+
+
+def get(key, fmt='png'):
+    """Return (digest, bytes) for a cached image, or None"""
+    entry = _memory.get(key)
+    if entry is not None:
+        return entry
+
+    digest = lookup_digest(key)
+    if digest is None:
+        return None
+    try:
+        with open(_blob_path(digest, fmt), 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    _memory.put(key, digest, data)
+    return digest, data
+
+
+def put(key, data, fmt='png'):
+    """Store rendered image bytes under key; returns the content digest"""
+    digest = content_digest(data)
+    path = _blob_path(digest, fmt)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    conn = _connect()
+    try:
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO refs (key, digest, created_at) VALUES (?, ?, ?)",
+                         (key, digest, time.time()))
+    finally:
+        conn.close()
+    _memory.put(key, digest, data)
+    return digest
+
+
+def get_or_render(catcher_id, game_pk, date, render, fmt='png', is_final=None):
+    """Return (digest, bytes), calling render() only on a cache miss.
+
+    render() may return None (nothing to plot), which yields (None, None) and
+    is not cached. Plots for today's games, or a past day whose data may still
+    change, are rendered every time and never stored. is_final() replaces
+    that day check for plots spanning several days; it is asked again after
+    rendering, since the render may have fetched the final data.
+    """
+    key = plot_key(catcher_id, game_pk, date, fmt)
+    if is_final is None:
+        is_final = partial(is_final_date, date)
+    if is_final():
+        cached = get(key, fmt)
+        count_cache('plot', cached is not None)
+        if cached is not None:
+            return cached
+
+    data = render()
+    if data is None:
+        return None, None
+    if not is_final():
+        return content_digest(data), data
+    return put(key, data, fmt), data
+
+
+def clear():
+    """Remove every cached image, on disk and in memory"""
+    _memory.clear()
+    shutil.rmtree(PLOT_CACHE_DIR, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the rendered plot cache")
+    parser.add_argument('command', choices=['clear'])
+    args = parser.parse_args()
+
+    if args.command == 'clear':
+        clear()
+        print(f"Cleared plot cache at {PLOT_CACHE_DIR}")
+
+
+if __name__ == '__main__':
+    main()
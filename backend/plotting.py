@@ -0,0 +1,229 @@
+"""Shadow-zone gameday summary plot.
+
+Bump PLOT_VERSION whenever the rendered output changes; it is part of every
+rendered-plot cache key (see plot_cache.py), so old images stop being served.
+"""
+import io
+
+import matplotlib
+import numpy as np
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+from matplotlib.collections import EllipseCollection
+from matplotlib.lines import Line2D
+
+from density import draw_density, get_density
+from zones import BALL_RADIUS, is_in_shadow_zone, is_in_strike_zone
+
+PLOT_VERSION = 3
+
+# Formats the plot endpoints can return, with their MIME types
+PLOT_MIMETYPES = {
+    'png': 'image/png',
+    'webp': 'image/webp',
+    'svg': 'image/svg+xml',
+}
+
+# Pitch colors from your original code
+PITCH_COLORS = {
+    'FF': '#D62828', 'SI': '#F77F00', 'FC': '#7F4F24', 'CH': '#43AA8B',
+    'FS': '#3A9D9A', 'FO': '#4ECDC4', 'SC': '#90BE6D', 'CU': '#48CAE4',
+    'KC': '#6930C3', 'CS': '#3A0CA3', 'SL': '#F9C74F', 'ST': '#F8961E', 'SV': '#90A0C0'
+}
+
+# Area (points^2) of the extra/lost call asterisk marker
+ASTERISK_SIZE = 60
+
+# Above this many called shadow-zone pitches (multi-game ranges) the plot draws
+# a called-strike-rate hexbin instead of one marker per pitch
+MAX_MARKER_PITCHES = 1500
+HEXBIN_GRIDSIZE = 30
+HEXBIN_MIN_PITCHES = 3
+
+# Batter hand -> outline style (dotted outline for lefties)
+HAND_LINESTYLES = {'R': 'solid', 'L': (0, (1, 1, 0, 1))}
+
+def _new_figure():
+    # Figures are built directly instead of through pyplot, so no global figure
+    # state is shared between threads rendering at the same time
+    fig = Figure(figsize=(8, 8))
+    return fig, fig.subplots()
+
+def _draw_pitch_markers(ax, called_df, true_strike):
+    """Draw every called pitch with a few collections instead of one artist per pitch"""
+    colors = called_df['pitch_type'].map(PITCH_COLORS).astype(object).fillna('white').to_numpy()
+    xy = called_df[['plate_x', 'plate_z']].to_numpy()
+    is_strike = (called_df['description'] == 'called_strike').to_numpy()
+    is_right = (called_df['stand'] == 'R').to_numpy()
+
+    # Called strikes: ball-sized circles in data units, one fill and one white
+    # outline collection per batter hand
+    diameter = 2 * BALL_RADIUS
+    for right in (True, False):
+        group = is_strike & (is_right == right)
+        if not group.any():
+            continue
+        linestyle = HAND_LINESTYLES['R' if right else 'L']
+        n = int(group.sum())
+        ax.add_collection(EllipseCollection(
+            [diameter] * n, [diameter] * n, [0] * n, units='xy', offsets=xy[group], offset_transform=ax.transData,
+            facecolors=list(colors[group]), edgecolors=list(colors[group]), linewidths=1.5, linestyles=linestyle,
+            alpha=0.8, zorder=1))
+        ax.add_collection(EllipseCollection(
+            [diameter] * n, [diameter] * n, [0] * n, units='xy', offsets=xy[group], offset_transform=ax.transData,
+            facecolors='none', edgecolors='white', linewidths=2.2, linestyles=linestyle, zorder=1))
+
+    # Balls: one scatter of x markers
+    balls = ~is_strike
+    if balls.any():
+        ax.scatter(xy[balls, 0], xy[balls, 1], marker='x', c=list(colors[balls]), s=13 ** 2, linewidths=3,
+                   alpha=0.8, zorder=2)
+
+    # Extra strikes (called strike outside the zone) and lost strikes (ball in the zone)
+    missed = is_strike != true_strike
+    if missed.any():
+        ax.scatter(xy[missed, 0], xy[missed, 1], marker=r'$\mathbf{*}$', c='white', s=ASTERISK_SIZE, linewidths=0, zorder=3)
+
+def _draw_strike_rate_hexbin(ax, called_df):
+    """Called-strike rate per hexagonal cell, with a small colorbar in the corner"""
+    is_strike = (called_df['description'] == 'called_strike').to_numpy(dtype=float)
+    cells = ax.hexbin(
+        called_df['plate_x'].to_numpy(), called_df['plate_z'].to_numpy(), C=is_strike,
+        reduce_C_function=np.mean, gridsize=HEXBIN_GRIDSIZE, extent=(-1.5, 1.5, 0.5, 4.5),
+        mincnt=HEXBIN_MIN_PITCHES, cmap='inferno', vmin=0, vmax=1, linewidths=0.3, edgecolors='black', zorder=1)
+    cax = ax.inset_axes([0.66, 0.95, 0.3, 0.02])
+    colorbar = ax.figure.colorbar(cells, cax=cax, orientation='horizontal')
+    colorbar.set_label('Called Strike Rate', color='white', fontsize=9, weight='bold')
+    colorbar.ax.tick_params(color='white', labelcolor='white', labelsize=8)
+    colorbar.outline.set_edgecolor('white')
+
+def plot_gameday_summary_inferno_shadow_only(df, player_name, matchup_date):
+    """Your gameday summary plot but ONLY for shadow zone pitches"""
+    
+    # FILTER TO SHADOW ZONES ONLY based on coordinates (a filtered frame; the
+    # caller's data is never modified, so no defensive copies are needed)
+    df = df[is_in_shadow_zone(df)]
+    
+    if df.empty:
+        # Create empty plot if no shadow zone data
+        fig, ax = _new_figure()
+        ax.text(0.5, 0.5, 'No shadow zone pitch data available\n(borderline pitches)', 
+                ha='center', va='center', transform=ax.transAxes, color='white')
+        ax.set_facecolor('black')
+        fig.patch.set_facecolor('black')
+        return fig
+    
+    # Only called pitches in shadow zones
+    called_df = df[df['description'].isin(['called_strike', 'ball'])]
+    
+    if called_df.empty:
+        # Create empty plot if no called shadow zone data
+        fig, ax = _new_figure()
+        ax.text(0.5, 0.5, 'No called pitches in shadow zones\n(borderline pitches)', 
+                ha='center', va='center', transform=ax.transAxes, color='white')
+        ax.set_facecolor('black')
+        fig.patch.set_facecolor('black')
+        return fig
+        
+    # Calculate true strike zone for shadow zone pitches
+    true_strike = is_in_strike_zone(called_df)
+    is_strike = (called_df['description'] == 'called_strike').to_numpy()
+    strike_kde = called_df[is_strike]
+    
+    # SHADOW ZONE CALLED STRIKE RATE
+    cs_pct = len(strike_kde) / len(called_df) if len(called_df) > 0 else 0
+    extra_count = int((is_strike & ~true_strike).sum())
+    lost_count = int((~is_strike & true_strike).sum())
+
+    fig, ax = _new_figure()
+    ax.grid(False)
+
+    # Multi-game ranges can hold thousands of pitches; past MAX_MARKER_PITCHES
+    # individual markers are unreadable, so show the called-strike rate per area
+    show_markers = len(called_df) <= MAX_MARKER_PITCHES
+    if show_markers:
+        # Original Inferno KDE Heatmap (only shadow zone strikes)
+        if len(strike_kde) > 0:
+            # Binned KDE drawn as one raster (see density.py)
+            draw_density(ax, get_density(strike_kde['plate_x'].to_numpy(), strike_kde['plate_z'].to_numpy()),
+                         cmap='inferno', alpha=0.5, thresh=0.05)
+
+        # Plot only shadow zone pitches
+        _draw_pitch_markers(ax, called_df, true_strike)
+    else:
+        _draw_strike_rate_hexbin(ax, called_df)
+
+    # Strike zone
+    zone_top, zone_bot = 3.5, 1.5
+    ax.plot([-0.7083, 0.7083], [zone_top, zone_top], color='white', lw=2, linestyle='dotted')
+    ax.plot([-0.7083, 0.7083], [zone_bot, zone_bot], color='white', lw=2, linestyle='dotted')
+    ax.plot([-0.7083, -0.7083], [zone_bot, zone_top], color='white', lw=2)
+    ax.plot([0.7083, 0.7083], [zone_bot, zone_top], color='white', lw=2)
+    ax.plot([-0.7083, 0.7083], [0.56, 0.56], color='white', lw=2)
+
+    # Axes and styling
+    ax.set_xlim(-1.5, 1.5)
+    ax.set_ylim(0.5, 4.5)
+    ax.set_aspect('equal', adjustable='datalim')
+    ax.set_xticks([-1.5, -1.0, -0.7083, -0.5, -0.25, 0, 0.25, 0.5, 0.7083, 1.0, 1.5])
+    ax.set_xticklabels(['18"', '12"', 'Edge', '6"', '3"', '0"', '3"', '6"', 'Edge', '12"', '18"'])
+    ax.set_xlabel("Horizontal Distance from Plate Center", fontsize=11, labelpad=12, color='white', weight='bold')
+    ax.set_ylabel("Vertical Position (feet from ground)", fontsize=11, labelpad=10, color='white', weight='bold')
+    ax.tick_params(color='white', labelcolor='white', width=1.5, length=6, labelsize=10)
+    for spine in ax.spines.values():
+        spine.set_color('white')
+        spine.set_linewidth(1.5)
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+
+    # Text and annotations - UPDATED TEXT
+    ax.text(0, 0.64, "Catcher's Perspective", ha='center', va='center', fontsize=9, color='white')
+    anchor_x, anchor_y = 1.58, 1.25
+    ax.text(anchor_x, anchor_y, "Shadow Zone CS Rate:", fontsize=10, color='white', ha='center', weight='bold')
+    ax.text(anchor_x, anchor_y - 0.115, f"{cs_pct:.1%}", fontsize=14, color='white', ha='center', weight='bold')
+    ax.text(anchor_x, anchor_y - 0.245, f"Extra Strikes: {extra_count}", fontsize=10, color='white', ha='center', weight='bold')
+    ax.text(anchor_x, anchor_y - 0.335, f"Lost Strikes: {lost_count}", fontsize=10, color='white', ha='center', weight='bold')
+    if show_markers:
+        ax.text(anchor_x, anchor_y - 0.435, "*Extra/Lost Call", fontsize=8, color='white', ha='center', style='italic')
+    ax.text(anchor_x, anchor_y - 0.535, f"n = {len(called_df)} pitches", fontsize=8, color='white', ha='center', style='italic')
+    ax.text(-1.83, 0.68, "@KICKDIRTBB", fontsize=9, color='white', weight='bold', style='italic')
+
+    # Title
+    ax.set_title(f"{player_name}\nShadow Zone Summary - {matchup_date}",
+                 fontsize=14, color='white', weight='bold', pad=20)
+
+    # Legend
+    if not show_markers:
+        fig.patch.set_facecolor('black')
+        ax.set_facecolor('black')
+        fig.tight_layout()
+        return fig
+
+    pitch_types = sorted(df['pitch_type'].dropna().unique())
+    pitch_legend = [Line2D([0], [0], marker='o', linestyle='None', label=pt,
+        markerfacecolor=PITCH_COLORS.get(pt, 'white'), markeredgecolor='none', markersize=10)
+        for pt in pitch_types if pt in PITCH_COLORS]
+    legend_elements = pitch_legend + [
+        Line2D([0], [0], marker='o', color='white', label='CS vs RHH',
+               markerfacecolor='none', markeredgecolor='white', markersize=10, lw=2, linestyle='solid'),
+        Line2D([0], [0], marker='o', color='white', label='CS vs LHH',
+               markerfacecolor='none', markeredgecolor='white', markersize=10, lw=2, linestyle=(0, (1, 1, 0, 1))),
+        Line2D([0], [0], marker='x', color='white', label='Ball',
+               markersize=10, linestyle='None', markeredgewidth=2)
+    ]
+    ax.legend(handles=legend_elements, loc='upper left', frameon=True,
+              facecolor='black', edgecolor='white', labelcolor='white').set_bbox_to_anchor((0.01, 1.01))
+
+    fig.patch.set_facecolor('black')
+    ax.set_facecolor('black')
+    fig.tight_layout()
+    
+    return fig
+
+
+def render_plot(df, player_name, matchup_date, fmt='png'):
+    """Render the shadow-zone summary and return the encoded image bytes"""
+    fig = plot_gameday_summary_inferno_shadow_only(df, player_name, matchup_date)
+    img_buffer = io.BytesIO()
+    fig.savefig(img_buffer, format=fmt, bbox_inches='tight', dpi=150)
+    return img_buffer.getvalue()
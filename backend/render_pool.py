@@ -0,0 +1,153 @@
+"""Process pool for CPU-bound plot rendering.
+
+Matplotlib rendering holds the GIL, so plots rendered on the server's request
+threads serialize. Instead each render is shipped (as the small per-catcher
+DataFrame) to a pool of long-lived worker processes that imported matplotlib
+and configured the Agg backend at startup. Every process is started as soon as
+the pool is (the server does this when each worker boots, see
+gunicorn.conf.py), so the first burst of renders doesn't pay for imports.
+
+The number of jobs queued or running is bounded. When the pool is full,
+render() raises RenderPoolBusy immediately instead of queueing; the API turns
+that into a 503 with Retry-After. A job that takes longer than the timeout
+raises RenderPoolBusy too.
+
+The pool is one process by default: every server worker and the precompute
+worker start their own pool at boot, and os.cpu_count() reports the host's
+cores rather than a container's CPU quota. Raise RENDER_PROCESSES on machines
+with cores and memory to spare; set it to 0 to render in the calling thread
+(handy for debugging).
+"""
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from metrics import STAGE_DURATION
+
+RENDER_PROCESSES = int(os.environ.get('RENDER_PROCESSES', 1))
+RENDER_MAX_PENDING = int(os.environ.get('RENDER_MAX_PENDING', RENDER_PROCESSES * 4))
+RENDER_TIMEOUT_SECONDS = float(os.environ.get('RENDER_TIMEOUT_SECONDS', 30))
+RETRY_AFTER_SECONDS = int(os.environ.get('RENDER_RETRY_AFTER_SECONDS', 5))
+
+
+class RenderPoolBusy(Exception):
+    """The pool is at capacity or the job timed out; retry after retry_after seconds"""
+
+    def __init__(self, message, retry_after=RETRY_AFTER_SECONDS):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _warm_worker():
+    # Pay matplotlib import and font-cache costs once per process
+    import pandas as pd
+    import plotting
+    plotting.render_plot(pd.DataFrame(columns=['plate_x', 'plate_z', 'sz_top', 'sz_bot']), '', '')
+
+
+def _ping():
+    return os.getpid()
+
+
+def _render_job(df, player_name, matchup_date, fmt):
+    """Runs in the worker; returns the image and the pure render time (no queueing)"""
+    from plotting import render_plot
+    started = time.perf_counter()
+    image = render_plot(df, player_name, matchup_date, fmt)
+    return image, time.perf_counter() - started
+
+
+class RenderPool:
+    def __init__(self, processes=RENDER_PROCESSES, max_pending=RENDER_MAX_PENDING, timeout=RENDER_TIMEOUT_SECONDS):
+        self.processes = processes
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(max_pending, 1))
+        self._executor = None
+        self._warming = []
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a multi-threaded web server process is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_warm_worker,
+                )
+                # The executor only spawns a process when a job finds no idle
+                # one; queue one no-op per process so all of them start (and
+                # warm up) now rather than one per job during the first burst
+                self._warming = [self._executor.submit(_ping) for _ in range(self.processes)]
+            return self._executor
+
+    def start(self, wait=False):
+        """Start and warm every worker process; wait=True blocks until they're ready"""
+        if self.processes <= 0:
+            return
+        self._get_executor()
+        if wait:
+            for future in self._warming:
+                future.result()
+
+    def render(self, df, player_name, matchup_date, fmt='png'):
+        """Render a plot in a worker process and return the image bytes"""
+        if self.processes <= 0:
+            image, elapsed = _render_job(df, player_name, matchup_date, fmt)
+            STAGE_DURATION.observe(elapsed, stage='render_worker')
+            return image
+
+        if not self._slots.acquire(blocking=False):
+            raise RenderPoolBusy("Plot renderer is busy")
+        try:
+            future = self._get_executor().submit(_render_job, df, player_name, matchup_date, fmt)
+        except Exception:
+            self._slots.release()
+            raise
+        # The slot is held until the job really finishes, even if we stop waiting
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            image, elapsed = future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise RenderPoolBusy(f"Plot rendering timed out after {self.timeout:.0f}s")
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); start a fresh pool on the next job
+            self.shutdown()
+            raise
+        STAGE_DURATION.observe(elapsed, stage='render_worker')
+        return image
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def configure_render_pool(processes):
+    """Replace the process-wide pool with one of a different size, started right away"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = RenderPool(processes=processes, max_pending=processes * 4)
+        _pool.start()
+        return _pool
+
+
+def get_render_pool():
+    """Process-wide RenderPool, created and started on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = RenderPool()
+            _pool.start()
+        return _pool
@@ -0,0 +1,244 @@
+"""Persisted per-catcher daily framing rollups for range leaderboards.
+
+Each completed day is aggregated once (see aggregation.py) and its per-catcher
+counts are stored in SQLite, one row per catcher per game. A season-to-date or
+last-N-days leaderboard is then a SUM over a few thousand small rows instead of
+re-pulling and re-aggregating months of Statcast.
+
+Backfill from the command line with:
+
+    python rollups.py 2025-03-27 2025-06-30
+"""
+import argparse
+import os
+import sqlite3
+import time
+from datetime import date as date_cls, datetime, timedelta
+from functools import partial
+
+from aggregation import aggregate_catcher_games
+from metrics import timed
+from singleflight import SingleFlight
+from statcast_cache import first_stored_date, get_statcast_day, is_day_final, is_day_stored
+
+ROLLUP_DB_PATH = os.environ.get(
+    'ROLLUP_DB_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'rollups.sqlite3')
+)
+# An empty day this recent may just be Savant lagging, so don't mark it done yet
+EMPTY_DAY_GRACE_DAYS = 2
+COUNT_COLUMNS = [
+    'called_pitches', 'called_strikes', 'shadow_pitches', 'shadow_strikes', 'extra_strikes', 'lost_strikes',
+]
+
+# Most Savant pulls a single API request may make; bigger gaps are for ingest.py
+REQUEST_FETCH_DAYS = int(os.environ.get('REQUEST_FETCH_DAYS', 3))
+
+_day_rollups = SingleFlight('rollups')
+
+
+class DaysNotStored(Exception):
+    """A range has more days missing from the local Statcast store than a request may fetch"""
+
+    def __init__(self, days):
+        super().__init__(
+            f"{len(days)} days between {days[0]} and {days[-1]} aren't in the local Statcast store yet; "
+            f"backfill them with `python ingest.py {days[0]} {days[-1]}`"
+        )
+        self.days = days
+
+
+def _connect():
+    os.makedirs(os.path.dirname(ROLLUP_DB_PATH), exist_ok=True)
+    conn = sqlite3.connect(ROLLUP_DB_PATH, timeout=30)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS catcher_games (
+            date TEXT NOT NULL,
+            game_pk INTEGER NOT NULL,
+            catcher_id INTEGER NOT NULL,
+            team TEXT,
+            {', '.join(f'{column} INTEGER NOT NULL' for column in COUNT_COLUMNS)},
+            PRIMARY KEY (date, game_pk, catcher_id)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS catcher_games_catcher ON catcher_games (catcher_id, date)")
+    conn.execute("CREATE TABLE IF NOT EXISTS ingested_days (date TEXT PRIMARY KEY, ingested_at REAL, games INTEGER)")
+    return conn
+
+
+def season_start(year):
+    """First day of year with data, rolled up or in the local Statcast store (Jan 1 if none).
+
+    Range defaults start here so off-season days nobody backfilled don't
+    count as missing.
+    """
+    conn = _connect()
+    try:
+        first_rolled_up = conn.execute(
+            "SELECT MIN(date) FROM ingested_days WHERE games > 0 AND date BETWEEN ? AND ?",
+            (f"{year}-01-01", f"{year}-12-31")
+        ).fetchone()[0]
+    finally:
+        conn.close()
+    dates = [date for date in (first_rolled_up, first_stored_date(year)) if date]
+    return min(dates, default=f"{year}-01-01")
+
+
+def date_range(start, end):
+    """Every YYYY-MM-DD date from start to end inclusive"""
+    day = date_cls.fromisoformat(start)
+    last = date_cls.fromisoformat(end)
+    while day <= last:
+        yield day.isoformat()
+        day += timedelta(days=1)
+
+
+def completed_dates(start, end):
+    """Dates in the range that are over (anything before today)"""
+    today = datetime.now().strftime('%Y-%m-%d')
+    return [day for day in date_range(start, end) if day < today]
+
+
+def ingested_dates(conn, start, end):
+    rows = conn.execute("SELECT date FROM ingested_days WHERE date BETWEEN ? AND ?", (start, end))
+    return {row[0] for row in rows}
+
+
+def ingest_day(date, conn=None, data=None):
+    """Aggregate one completed day and store its per-catcher rows; returns row count"""
+    own_conn = conn is None
+    conn = conn or _connect()
+    try:
+        if data is None:
+            data = get_statcast_day(date)
+        # Keep every catcher; minimum-pitch filters are applied at query time
+        games = aggregate_catcher_games(data, min_pitches=1)
+        rows = [
+            (date, int(game_pk), int(catcher_id), team, *(int(value) for value in counts))
+            for game_pk, catcher_id, team, *counts in zip(
+                games['game_pk'], games['catcher_id'], games['team'], *(games[column] for column in COUNT_COLUMNS)
+            )
+        ]
+        cutoff = (datetime.now() - timedelta(days=EMPTY_DAY_GRACE_DAYS)).strftime('%Y-%m-%d')
+        with conn:
+            conn.execute("DELETE FROM catcher_games WHERE date = ?", (date,))
+            conn.executemany(
+                f"INSERT INTO catcher_games (date, game_pk, catcher_id, team, {', '.join(COUNT_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * (4 + len(COUNT_COLUMNS)))})",
+                rows
+            )
+            # A day with games counts as done only once its pull is final;
+            # until then it is rolled up again on the next request
+            if (rows and is_day_final(date)) or (not rows and date < cutoff):
+                conn.execute(
+                    "INSERT OR REPLACE INTO ingested_days (date, ingested_at, games) VALUES (?, ?, ?)",
+                    (date, time.time(), int(games['game_pk'].nunique()))
+                )
+        return len(rows)
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def ensure_ingested(start, end, fetch_limit=None):
+    """Roll up every completed day in the range that isn't stored yet; returns those days.
+
+    Days already in the local Statcast store are rolled up from disk. With
+    fetch_limit set (API requests), more than that many days needing a Savant
+    pull raise DaysNotStored instead of pulling them one after another.
+    """
+    conn = _connect()
+    try:
+        done = ingested_dates(conn, start, end)
+    finally:
+        conn.close()
+    missing = [day for day in completed_dates(start, end) if day not in done]
+    if fetch_limit is not None:
+        unstored = [day for day in missing if not is_day_stored(day)]
+        if len(unstored) > fetch_limit:
+            raise DaysNotStored(unstored)
+
+    for day in missing:
+        print(f"Rolling up {day}...")
+        with timed('rollup_ingest_day'):
+            # Requests overlapping the same days share each day's rollup
+            _day_rollups.do(day, partial(ingest_day, day))
+    return missing
+
+
+def is_range_final(start, end):
+    """True once every day in [start, end] is rolled up for good and past the empty-day grace window"""
+    cutoff = (datetime.now() - timedelta(days=EMPTY_DAY_GRACE_DAYS)).strftime('%Y-%m-%d')
+    if end >= cutoff:
+        return False
+    conn = _connect()
+    try:
+        done = ingested_dates(conn, start, end)
+    finally:
+        conn.close()
+    return all(day in done for day in date_range(start, end))
+
+
+def catcher_dates(catcher_id, start, end):
+    """Ingested dates in [start, end] on which the catcher caught, oldest first"""
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            "SELECT DISTINCT date FROM catcher_games WHERE catcher_id = ? AND date BETWEEN ? AND ? ORDER BY date",
+            (catcher_id, start, end)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [row[0] for row in rows]
+
+
+def leaderboard(start, end, min_pitches=0):
+    """Summed framing counts per catcher over [start, end], best net strikes first"""
+    conn = _connect()
+    try:
+        # With a single MAX() aggregate, SQLite takes the bare `team` column from
+        # the same row, i.e. the catcher's most recent team in the range
+        with timed('leaderboard_query'):
+            rows = conn.execute(f"""
+                SELECT catcher_id, team, MAX(date) AS last_date, COUNT(*) AS games,
+                       {', '.join(f'SUM({column}) AS {column}' for column in COUNT_COLUMNS)}
+                FROM catcher_games
+                WHERE date BETWEEN ? AND ?
+                GROUP BY catcher_id
+                HAVING SUM(called_pitches) >= ?
+            """, (start, end, min_pitches)).fetchall()
+    finally:
+        conn.close()
+
+    board = []
+    for catcher_id, team, last_date, games, called, strikes, shadow, shadow_strikes, extra, lost in rows:
+        board.append({
+            "id": catcher_id,
+            "team": team,
+            "games": games,
+            "last_date": last_date,
+            "called_strike_rate": round(shadow_strikes / shadow, 3) if shadow else 0,  # Shadow zones only
+            "total_strike_rate": round(strikes / called, 3) if called else 0,
+            "extra_strikes": extra,
+            "lost_strikes": lost,
+            "net_strikes": extra - lost,
+            "total_called_pitches": called,
+            "shadow_zone_pitches": shadow,
+        })
+    board.sort(key=lambda row: (row['net_strikes'], row['called_strike_rate']), reverse=True)
+    return board
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill per-catcher daily framing rollups")
+    parser.add_argument('start', help="First date (YYYY-MM-DD)")
+    parser.add_argument('end', nargs='?', default=(datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d'),
+                        help="Last date (YYYY-MM-DD), defaults to yesterday")
+    args = parser.parse_args()
+
+    missing = ensure_ingested(args.start, args.end)
+    print(f"Ingested {len(missing)} new days between {args.start} and {args.end}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""MLB schedule lookups through the Stats API.
+
+Anything built from a day and stored for good (summaries, pre-rendered plots)
+should wait until every game on that day's slate is over.
+"""
+import threading
+
+import requests
+
+from players import MLB_STATSAPI_URL
+
+_final_dates = set()  # A slate that was final once stays final
+_lock = threading.Lock()
+
+
+def slate_is_final(date):
+    """True if every game on the MLB schedule for date is over, None if unknown"""
+    with _lock:
+        if date in _final_dates:
+            return True
+    try:
+        response = requests.get(
+            f"{MLB_STATSAPI_URL}/schedule",
+            params={'sportId': 1, 'date': date},
+            timeout=10
+        )
+        response.raise_for_status()
+        games = [game for day in response.json().get('dates', []) for game in day.get('games', [])]
+        # Postponed/cancelled games are also reported with abstractGameState 'Final'
+        final = all(game.get('status', {}).get('abstractGameState') == 'Final' for game in games)
+    except Exception as e:
+        print(f"Could not check schedule for {date}: {e}")
+        return None
+    if final:
+        with _lock:
+            _final_dates.add(date)
+    return final
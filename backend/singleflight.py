@@ -0,0 +1,49 @@
+"""Single-flight request coalescing.
+
+When several threads ask for the same key at once (ten dashboards opening the
+same date, or the same plot), only the first runs the computation; the others
+wait for it and get the same result or exception. Nothing is cached once the
+call finishes; the persistent caches behind each call handle that.
+
+Coalescing is per process. With several server workers, each worker runs at
+most one computation per key, and the on-disk caches pick up the rest.
+"""
+import threading
+from concurrent.futures import Future
+
+from metrics import COALESCED_REQUESTS
+
+
+class SingleFlight:
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """Return fn(), sharing one in-flight call among concurrent callers with the same key"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+
+        if not leader:
+            COALESCED_REQUESTS.inc(group=self.name)
+            return call.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
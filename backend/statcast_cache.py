@@ -0,0 +1,274 @@
+"""Per-date Statcast cache shared by the catcher list and plot endpoints.
+
+Each day is pulled from Baseball Savant once, projected down to the columns the
+backend actually uses, downcast to compact dtypes and written to disk as
+Parquet. A pull made once the day was over (plus a settling margin, see
+final_after) never changes and is kept forever; anything pulled earlier,
+including today, is refetched after a TTL. A small in-process LRU (capped by
+memory, not entry count) sits in front of the disk so a plot click right after
+the list view is a dictionary lookup.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date as date_cls, datetime, timedelta
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pybaseball as pyb
+
+from metrics import count_cache, count_rows, timed
+
+# Bump CACHE_VERSION whenever STATCAST_COLUMNS or their dtypes change so stale files are ignored
+CACHE_VERSION = 4
+
+# Only the columns read anywhere in the backend
+STATCAST_COLUMNS = [
+    'game_pk', 'game_date', 'fielder_2', 'description', 'pitch_type', 'stand',
+    'plate_x', 'plate_z', 'sz_top', 'sz_bot', 'home_team', 'away_team', 'inning_topbot', 'balls', 'strikes',
+]
+
+# Compact dtypes for the projected columns: a day is ~40 bytes per pitch instead
+# of the kilobyte-plus of pybaseball's 90-column object/float64 frame
+FLOAT32_COLUMNS = ['plate_x', 'plate_z', 'sz_top', 'sz_bot']
+INT32_COLUMNS = ['game_pk', 'fielder_2']
+# Ball-strike count, nullable since older pulls and some feeds leave it empty
+INT8_COLUMNS = ['balls', 'strikes']
+CATEGORY_COLUMNS = ['description', 'pitch_type', 'stand', 'home_team', 'away_team', 'inning_topbot']
+
+CACHE_DIR = os.environ.get(
+    'STATCAST_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'statcast')
+)
+# 'savant' pulls through pybaseball; 'fake' generates offline data (see fakes.py)
+STATCAST_SOURCE = os.environ.get('STATCAST_SOURCE', 'savant')
+TODAY_TTL_SECONDS = int(os.environ.get('STATCAST_TODAY_TTL', 15 * 60))
+# Hours after midnight (server time) before a day's pull is final: covers West
+# Coast extra innings and Savant's processing lag
+FINAL_AFTER_HOURS = int(os.environ.get('STATCAST_FINAL_AFTER_HOURS', 12))
+# An empty pull may be Savant lagging rather than an off day, so it only
+# counts as final when made this many days after the date
+EMPTY_FINAL_AFTER_DAYS = 2
+MEMORY_CAP_BYTES = int(os.environ.get('STATCAST_MEMORY_CAP_MB', 256)) * 1024 * 1024
+
+
+class DayLRU:
+    """Thread-safe LRU of DataFrames bounded by total memory footprint"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()  # date -> (df, nbytes, loaded_at)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, df, loaded_at):
+        nbytes = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            if nbytes > self.max_bytes:
+                # A single day larger than the cap is served but not retained
+                return
+            self._entries[key] = (df, nbytes, loaded_at)
+            self.total_bytes += nbytes
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_bytes, _) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_bytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+
+_memory = DayLRU(MEMORY_CAP_BYTES)
+_fetch_locks = {}
+_fetch_locks_guard = threading.Lock()
+
+
+def check_date(date):
+    """Raise ValueError unless date is a normalized YYYY-MM-DD string; dates become file names"""
+    if not isinstance(date, str) or date_cls.fromisoformat(date).isoformat() != date:
+        raise ValueError(f"Not a YYYY-MM-DD date: {date!r}")
+    return date
+
+
+def _day_path(date):
+    check_date(date)
+    return os.path.join(CACHE_DIR, f"v{CACHE_VERSION}", f"{date}.parquet")
+
+
+def final_after(date):
+    """Timestamp after which a pull of date is complete: the day's end plus FINAL_AFTER_HOURS"""
+    day_end = datetime.fromisoformat(date) + timedelta(days=1)
+    return (day_end + timedelta(hours=FINAL_AFTER_HOURS)).timestamp()
+
+
+def _is_fresh(date, rows, loaded_at):
+    """Pulls made after final_after(date) are kept forever; others expire after TODAY_TTL_SECONDS.
+
+    That covers today and a past day pulled while its night games were still
+    running or before Savant caught up. An empty pull is kept forever only
+    once it was made EMPTY_FINAL_AFTER_DAYS after the date (an off day or the
+    off-season), so a backfill doesn't refetch those on every run.
+    """
+    if rows > 0 and loaded_at >= final_after(date):
+        return True
+    empty_final_after = datetime.fromisoformat(date) + timedelta(days=1 + EMPTY_FINAL_AFTER_DAYS)
+    if rows == 0 and loaded_at >= empty_final_after.timestamp():
+        return True
+    return time.time() - loaded_at < TODAY_TTL_SECONDS
+
+
+def project_columns(data):
+    """Keep only STATCAST_COLUMNS, adding any that are missing as nulls"""
+    return data.reindex(columns=STATCAST_COLUMNS).reset_index(drop=True)
+
+
+def compact_types(data):
+    """Downcast a projected frame to float32/int32/int8/categorical.
+
+    Pitches without a game or catcher id can't be attributed to anyone, so
+    they are dropped rather than forcing the id columns to a nullable type.
+    """
+    known = data[INT32_COLUMNS].notna().all(axis=1)
+    if not known.all():
+        data = data[known].reset_index(drop=True)
+    for column in FLOAT32_COLUMNS:
+        data[column] = pd.to_numeric(data[column], errors='coerce').astype('float32')
+    for column in INT32_COLUMNS:
+        data[column] = data[column].astype('int32')
+    for column in INT8_COLUMNS:
+        data[column] = pd.to_numeric(data[column], errors='coerce').astype('Int8')
+    for column in CATEGORY_COLUMNS:
+        data[column] = data[column].astype('category')
+    return data
+
+
+def _write_parquet(df, path):
+    # Write to a temp file and rename so readers never see a partial file
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def _statcast_source():
+    if STATCAST_SOURCE == 'fake':
+        from fakes import fake_statcast
+        return fake_statcast
+    return pyb.statcast
+
+
+def _fetch_remote(date):
+    print(f"Fetching Statcast data for {date} from Baseball Savant...")
+    with timed('statcast_fetch'):
+        data = _statcast_source()(start_dt=date, end_dt=date)
+    if data is None:
+        data = pd.DataFrame()
+    count_rows('statcast_fetch', len(data))
+    # Project before downcasting so the wide frame can be freed as soon as possible
+    data = project_columns(data)
+    return compact_types(data)
+
+
+def _lock_for(date):
+    with _fetch_locks_guard:
+        return _fetch_locks.setdefault(date, threading.Lock())
+
+
+def get_statcast_day(date):
+    """Return the projected Statcast pitches for one date (YYYY-MM-DD).
+
+    The returned DataFrame is shared between callers and must be treated as
+    read-only; filter it or ``.copy()`` before adding columns.
+    """
+    entry = _memory.get(date)
+    if entry is not None and _is_fresh(date, len(entry[0]), entry[2]):
+        count_cache('statcast_memory', True)
+        return entry[0]
+    count_cache('statcast_memory', False)
+
+    # One fetch per date at a time; other threads wait and reuse the result
+    with _lock_for(date):
+        entry = _memory.get(date)
+        if entry is not None and _is_fresh(date, len(entry[0]), entry[2]):
+            return entry[0]
+
+        path = _day_path(date)
+        if os.path.exists(path):
+            loaded_at = os.path.getmtime(path)
+            with timed('statcast_disk_read'):
+                df = pd.read_parquet(path)
+            if _is_fresh(date, len(df), loaded_at):
+                count_cache('statcast_disk', True)
+                _memory.put(date, df, loaded_at)
+                return df
+        count_cache('statcast_disk', False)
+
+        df = _fetch_remote(date)
+        with timed('statcast_disk_write'):
+            _write_parquet(df, path)
+        _memory.put(date, df, time.time())
+        return df
+
+
+def is_day_stored(date):
+    """True if date is on disk and fresh, i.e. get_statcast_day won't refetch it"""
+    path = _day_path(date)
+    try:
+        loaded_at = os.path.getmtime(path)
+        rows = pq.read_metadata(path).num_rows
+    except (FileNotFoundError, OSError):
+        return False
+    return _is_fresh(date, rows, loaded_at)
+
+
+def first_stored_date(year):
+    """Earliest date of year with a file in the local store, or None"""
+    try:
+        names = os.listdir(os.path.join(CACHE_DIR, f"v{CACHE_VERSION}"))
+    except FileNotFoundError:
+        return None
+    dates = [name[:-len('.parquet')] for name in names if name.startswith(f"{year}-") and name.endswith('.parquet')]
+    return min(dates, default=None)
+
+
+def is_day_final(date):
+    """True if the stored pull of date was made after final_after(date), so it will never change.
+
+    Caches built from a day (rollups, plots, summaries) should only be kept
+    permanently when this holds.
+    """
+    try:
+        return os.path.getmtime(_day_path(date)) >= final_after(date)
+    except OSError:
+        return False
+
+
+def store_day(date):
+    """Fetch one date and write it to disk, skipping the in-memory layer; returns row count.
+
+    Used for bulk backfills (see ingest.py), where holding every day in memory
+    would defeat the cap.
+    """
+    with _lock_for(date):
+        df = _fetch_remote(date)
+        with timed('statcast_disk_write'):
+            _write_parquet(df, _day_path(date))
+        return len(df)
+
+
+def clear_memory_cache():
+    """Drop the in-process layer (the on-disk files are left alone)"""
+    _memory.clear()
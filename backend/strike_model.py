@@ -0,0 +1,349 @@
+"""Called-strike probability grid and strikes above expected.
+
+The rulebook box (zones.is_in_strike_zone) says whether a pitch *should* be a
+strike, but umpires call a fuzzy, count- and handedness-dependent zone, so
+"extra" and "lost" strikes counted against it are noisy. Instead, every called
+pitch in the local history is binned by location, batter hand and count, and
+the strike rate of each bin becomes a lookup grid:
+
+    grid[stand, count, z_bin, x_bin] -> P(called strike)
+
+Horizontal bins are in feet; vertical bins are relative to each pitch's own
+zone (0 = sz_bot, 1 = sz_top) so tall and short batters share bins. Sparse
+bins are smoothed spatially and shrunk towards the next coarser surface
+(count -> hand -> location only -> rulebook box). Scoring a pitch is then a
+single array index, so a season of pitches is scored in milliseconds.
+
+Grids are fit per season from the days already in the local Statcast store
+and saved as .npz files. Fitting reads every stored day of the season, so it
+never happens inside a request: the worker refits after each final day,
+ingest.py after a backfill, and the command line on demand (refit, then print
+strikes above expected for the range):
+
+    python strike_model.py 2025-03-27 2025-09-28
+
+Strikes above expected for a catcher is the sum of (called strike -
+P(called strike)) over their called pitches.
+"""
+import argparse
+import os
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from scipy.ndimage import gaussian_filter
+
+from aggregation import GROUP_KEYS, called_pitch_mask
+from metrics import count_cache, count_rows, timed
+from rollups import completed_dates
+from singleflight import SingleFlight
+from statcast_cache import get_statcast_day, is_day_stored
+from zones import BALL_RADIUS, PLATE_HALF_WIDTH
+
+# Bump when the binning or the smoothing changes so stale grids are rebuilt
+GRID_VERSION = 1
+
+STRIKE_MODEL_DIR = os.environ.get(
+    'STRIKE_MODEL_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'strike_model')
+)
+
+# Horizontal bins in feet; vertical bins as a fraction of the batter's zone height
+X_RANGE = (-2.0, 2.0)
+Z_RANGE = (-1.0, 2.0)
+X_STEP = 0.1
+Z_STEP = 0.1
+N_X = int(round((X_RANGE[1] - X_RANGE[0]) / X_STEP))
+N_Z = int(round((Z_RANGE[1] - Z_RANGE[0]) / Z_STEP))
+
+STANDS = ['L', 'R']
+MAX_BALLS = 3
+MAX_STRIKES = 2
+N_COUNTS = (MAX_BALLS + 1) * (MAX_STRIKES + 1)
+# The last stand/count slot holds the pooled surface, used when hand or count is unknown
+ANY_STAND = len(STANDS)
+ANY_COUNT = N_COUNTS
+GRID_SHAPE = (len(STANDS) + 1, N_COUNTS + 1, N_Z, N_X)
+
+# Gaussian smoothing of the per-bin counts, in bins
+SMOOTHING_BINS = 1.0
+# Pseudo-pitches of the coarser surface mixed into every bin
+PRIOR_STRENGTH = 20
+
+_grids = {}  # season -> (grid, mtime of the file it was loaded from)
+_grids_lock = threading.Lock()
+_builds = SingleFlight('strike_model')
+
+
+class GridNotFitted(Exception):
+    """No called-strike grid has been fit for the season yet"""
+
+    def __init__(self, season):
+        super().__init__(
+            f"No called-strike grid for {season} yet; fit it with "
+            f"`python strike_model.py {season}-01-01 {season}-12-31`"
+        )
+        self.season = season
+
+
+def _grid_path(season):
+    return os.path.join(STRIKE_MODEL_DIR, f"v{GRID_VERSION}", f"{season}.npz")
+
+
+def _float_column(data, column):
+    return pd.to_numeric(data[column], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+
+def grid_indices(data):
+    """Flat index into a grid for every pitch, or -1 where the location is missing"""
+    x = _float_column(data, 'plate_x')
+    z = _float_column(data, 'plate_z')
+    sz_top = _float_column(data, 'sz_top')
+    sz_bot = _float_column(data, 'sz_bot')
+    height = sz_top - sz_bot
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z_rel = (z - sz_bot) / height
+    located = np.isfinite(x) & np.isfinite(z_rel) & (height > 0)
+
+    # Pitches beyond the grid land in the outermost bins
+    x_bin = np.clip(np.floor((np.nan_to_num(x) - X_RANGE[0]) / X_STEP), 0, N_X - 1).astype(np.intp)
+    z_bin = np.clip(np.floor((np.nan_to_num(z_rel) - Z_RANGE[0]) / Z_STEP), 0, N_Z - 1).astype(np.intp)
+
+    stand = np.full(len(data), ANY_STAND, dtype=np.intp)
+    if 'stand' in data:
+        for i, hand in enumerate(STANDS):
+            stand[(data['stand'] == hand).to_numpy(dtype=bool, na_value=False)] = i
+
+    count = np.full(len(data), ANY_COUNT, dtype=np.intp)
+    if 'balls' in data and 'strikes' in data:
+        balls = _float_column(data, 'balls')
+        strikes = _float_column(data, 'strikes')
+        known = (balls >= 0) & (balls <= MAX_BALLS) & (strikes >= 0) & (strikes <= MAX_STRIKES)
+        count[known] = (balls[known] * (MAX_STRIKES + 1) + strikes[known]).astype(np.intp)
+
+    index = np.ravel_multi_index((stand, count, z_bin, x_bin), GRID_SHAPE)
+    return np.where(located, index, -1)
+
+
+def count_called(data):
+    """(called strikes, called pitches) per specific hand/count bin for one frame"""
+    called = data[called_pitch_mask(data)]
+    index = grid_indices(called)
+    is_strike = (called['description'] == 'called_strike').to_numpy(dtype=float)
+    # Only pitches with a known hand and count train the specific bins; the
+    # pooled surfaces are sums of those
+    stand, count, _, _ = np.unravel_index(np.maximum(index, 0), GRID_SHAPE)
+    usable = (index >= 0) & (stand != ANY_STAND) & (count != ANY_COUNT)
+    size = int(np.prod(GRID_SHAPE))
+    strikes = np.bincount(index[usable], weights=is_strike[usable], minlength=size)
+    pitches = np.bincount(index[usable], minlength=size).astype(float)
+    return (
+        strikes.reshape(GRID_SHAPE)[:ANY_STAND, :ANY_COUNT],
+        pitches.reshape(GRID_SHAPE)[:ANY_STAND, :ANY_COUNT],
+    )
+
+
+def _rulebook_surface():
+    """1 where a bin's centre is a rulebook strike, 0 elsewhere (the prior of last resort)"""
+    x = X_RANGE[0] + (np.arange(N_X) + 0.5) * X_STEP
+    z_rel = Z_RANGE[0] + (np.arange(N_Z) + 0.5) * Z_STEP
+    in_x = np.abs(x) <= PLATE_HALF_WIDTH + BALL_RADIUS
+    in_z = (z_rel >= 0) & (z_rel <= 1)
+    return (in_z[:, None] & in_x[None, :]).astype(float)
+
+
+def _shrink(strikes, pitches, prior):
+    return (strikes + PRIOR_STRENGTH * prior) / (pitches + PRIOR_STRENGTH)
+
+
+def fit_grid(strikes, pitches):
+    """Turn per-bin counts from count_called() into a float32 probability grid"""
+    sigma = (0, 0, SMOOTHING_BINS, SMOOTHING_BINS)
+    strikes = gaussian_filter(np.asarray(strikes, dtype=float), sigma=sigma, mode='nearest')
+    pitches = gaussian_filter(np.asarray(pitches, dtype=float), sigma=sigma, mode='nearest')
+
+    location = _shrink(strikes.sum(axis=(0, 1)), pitches.sum(axis=(0, 1)), _rulebook_surface())
+    by_stand = _shrink(strikes.sum(axis=1), pitches.sum(axis=1), location)
+
+    grid = np.empty(GRID_SHAPE)
+    grid[ANY_STAND, ANY_COUNT] = location
+    grid[:ANY_STAND, ANY_COUNT] = by_stand
+    grid[ANY_STAND, :ANY_COUNT] = _shrink(strikes.sum(axis=0), pitches.sum(axis=0), location)
+    grid[:ANY_STAND, :ANY_COUNT] = _shrink(strikes, pitches, by_stand[:, None])
+    return grid.astype(np.float32)
+
+
+def build_grid(dates):
+    """Fit a grid from the stored days among dates; returns (grid, days used, pitches used)"""
+    shape = (len(STANDS), N_COUNTS, N_Z, N_X)
+    strikes, pitches = np.zeros(shape), np.zeros(shape)
+    days = 0
+    with timed('strike_model_build'):
+        for date in dates:
+            # Only the local history: missing days are left to ingest.py / rollups
+            if not is_day_stored(date):
+                continue
+            day_strikes, day_pitches = count_called(get_statcast_day(date))
+            strikes += day_strikes
+            pitches += day_pitches
+            days += 1
+        grid = fit_grid(strikes, pitches)
+    count_rows('strike_model_build', int(pitches.sum()))
+    return grid, days, int(pitches.sum())
+
+
+def save_grid(season, grid, days, pitches):
+    path = _grid_path(season)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez_compressed(f, grid=grid, days=days, pitches=pitches)
+    os.replace(tmp_path, path)
+
+
+def load_grid(season):
+    """(grid, days used) for a season from disk, or None if it hasn't been built"""
+    try:
+        with np.load(_grid_path(season)) as stored:
+            return stored['grid'], int(stored['days'])
+    except FileNotFoundError:
+        return None
+
+
+def _season_dates(season):
+    return completed_dates(f"{season}-01-01", f"{season}-12-31")
+
+
+def get_season_grid(season):
+    """The season's fitted grid; raises GridNotFitted if it has never been fit.
+
+    Only loads: a file refit by another process (see refit_season_grid)
+    replaces the in-memory copy on the next call.
+    """
+    season = int(season)
+    try:
+        mtime = os.path.getmtime(_grid_path(season))
+    except OSError:
+        raise GridNotFitted(season)
+
+    with _grids_lock:
+        cached = _grids.get(season)
+    if cached is not None and cached[1] == mtime:
+        count_cache('strike_model', True)
+        return cached[0]
+    count_cache('strike_model', False)
+
+    loaded = load_grid(season)
+    if loaded is None:
+        raise GridNotFitted(season)
+    with _grids_lock:
+        _grids[season] = (loaded[0], mtime)
+    return loaded[0]
+
+
+def refit_season_grid(season):
+    """Fit the season's grid from every stored day and save it; returns the grid"""
+    season = int(season)
+
+    def build():
+        print(f"Fitting called-strike grid for {season}...")
+        grid, days, pitches = build_grid(_season_dates(season))
+        save_grid(season, grid, days, pitches)
+        print(f"Fit the {season} grid from {days} stored days ({pitches} called pitches)")
+        return grid
+
+    return _builds.do(season, build)
+
+
+def strike_probabilities(data, grid):
+    """P(called strike) for every pitch, NaN where the location is missing"""
+    index = grid_indices(data)
+    probabilities = grid.ravel()[np.maximum(index, 0)].astype(float)
+    probabilities[index < 0] = np.nan
+    return probabilities
+
+
+def score_catcher_games(data, grid):
+    """Called pitches, called strikes, expected strikes and strikes above expected per (game_pk, catcher)"""
+    called = data[called_pitch_mask(data)]
+    columns = ['game_pk', 'catcher_id', 'called_pitches', 'called_strikes', 'expected_strikes']
+    if called.empty:
+        return pd.DataFrame(columns=columns + ['strikes_above_expected'])
+
+    with timed('strike_model_score'):
+        scored = pd.DataFrame({
+            'game_pk': called['game_pk'].to_numpy(),
+            'fielder_2': called['fielder_2'].to_numpy(),
+            'called_pitches': 1,
+            'called_strikes': (called['description'] == 'called_strike').to_numpy(dtype=int),
+            'expected_strikes': strike_probabilities(called, grid),
+        })
+        games = scored.groupby(GROUP_KEYS, sort=False).sum().reset_index()
+    count_rows('strike_model_score', len(called))
+    games = games.rename(columns={'fielder_2': 'catcher_id'})
+    games['catcher_id'] = games['catcher_id'].astype('int64')
+    games['game_pk'] = games['game_pk'].astype('int64')
+    games = games[columns]
+    games['strikes_above_expected'] = games['called_strikes'] - games['expected_strikes']
+    return games
+
+
+def strikes_above_expected(start, end, min_pitches=0):
+    """Per-catcher strikes above expected over the stored days in [start, end], best first.
+
+    Scored against the grid for the season of ``end``.
+    """
+    grid = get_season_grid(end[:4])
+    frames = []
+    for date in completed_dates(start, end):
+        if is_day_stored(date):
+            frames.append(score_catcher_games(get_statcast_day(date), grid))
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return []
+
+    games = pd.concat(frames, ignore_index=True)
+    totals = games.groupby('catcher_id').agg(
+        games=('game_pk', 'nunique'),
+        called_pitches=('called_pitches', 'sum'),
+        called_strikes=('called_strikes', 'sum'),
+        expected_strikes=('expected_strikes', 'sum'),
+    )
+    totals = totals[totals['called_pitches'] >= min_pitches]
+    totals['strikes_above_expected'] = totals['called_strikes'] - totals['expected_strikes']
+    totals = totals.sort_values('strikes_above_expected', ascending=False)
+    return [
+        {
+            "id": int(catcher_id),
+            "games": int(row.games),
+            "called_pitches": int(row.called_pitches),
+            "called_strikes": int(row.called_strikes),
+            "expected_strikes": round(float(row.expected_strikes), 1),
+            "strikes_above_expected": round(float(row.strikes_above_expected), 1),
+            # Per 100 called pitches, comparable between starters and backups
+            "strikes_above_expected_per_100": round(100 * float(row.strikes_above_expected) / row.called_pitches, 2),
+        }
+        for catcher_id, row in zip(totals.index, totals.itertuples())
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit the called-strike grid and print strikes above expected")
+    parser.add_argument('start', help="First date (YYYY-MM-DD)")
+    parser.add_argument('end', nargs='?', default=(datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d'),
+                        help="Last date (YYYY-MM-DD), defaults to yesterday")
+    parser.add_argument('--min-pitches', type=int, default=0, help="Minimum called pitches to list a catcher")
+    parser.add_argument('--top', type=int, default=10, help="Catchers to print")
+    args = parser.parse_args()
+
+    refit_season_grid(args.end[:4])
+    board = strikes_above_expected(args.start, args.end, args.min_pitches)
+    print(f"{'catcher':>10}{'called':>9}{'strikes':>9}{'expected':>10}{'above':>8}")
+    for row in board[:args.top]:
+        print(f"{row['id']:>10}{row['called_pitches']:>9}{row['called_strikes']:>9}"
+              f"{row['expected_strikes']:>10.1f}{row['strikes_above_expected']:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
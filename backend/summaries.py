@@ -0,0 +1,252 @@
+"""Precomputed /api/statcast/catchers payloads.
+
+The nightly worker (worker.py) builds each completed day's catcher summaries
+once its slate is final and stores them as an immutable snapshot: the JSON
+body plus gzip (and, when the ``brotli`` package is installed, brotli)
+encodings of it. The API
+serves a stored snapshot's bytes as they are, with a strong ETag; browsers
+revalidate it for SETTLE_DAYS after the date before caching it long term.
+Days that haven't been precomputed are built on demand and stored the same
+way once final (is_storable) and every catcher's name has resolved; until
+then, including today, they are rebuilt on every request.
+
+Filtering, sorting and paging (query_summaries) run against the snapshot's
+records, so they never touch Statcast either.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from aggregation import TEAM_MAPPING, aggregate_catcher_games, to_catcher_records
+from metrics import count_cache
+from players import get_player_names
+from schedule import slate_is_final
+from singleflight import SingleFlight
+from statcast_cache import check_date, get_statcast_day, is_day_final
+
+try:
+    import brotli
+except ImportError:  # Optional: without it snapshots are served gzip-only
+    brotli = None
+
+# Bump when the payload shape or the aggregation changes (2: snapshots stored
+# with "Player <id>" placeholder names)
+SUMMARY_VERSION = 2
+
+SUMMARY_DIR = os.environ.get(
+    'SUMMARY_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'summaries')
+)
+SNAPSHOT_MEMORY_ENTRIES = 64
+
+# Stored snapshots of recent dates may still be corrected by a rebuild, so
+# browsers revalidate them; once a date is SETTLE_DAYS old its snapshot is
+# cached long term, and a SUMMARY_VERSION bump reaches browsers once that runs out
+SETTLE_DAYS = 7
+FINAL_CACHE_CONTROL = 'public, max-age=2592000'
+RECENT_CACHE_CONTROL = 'public, max-age=300, must-revalidate'
+TODAY_CACHE_CONTROL = 'no-cache'
+
+# Content-Encoding -> file suffix, in server preference order
+ENCODINGS = {'br': '.br', 'gzip': '.gz'} if brotli else {'gzip': '.gz'}
+# Responses smaller than this aren't worth compressing on the fly
+MIN_COMPRESS_BYTES = 1024
+
+SORT_FIELDS = [
+    'player_name', 'team', 'matchup', 'called_strike_rate', 'total_strike_rate',
+    'extra_strikes', 'lost_strikes', 'total_called_pitches', 'shadow_zone_pitches',
+]
+
+_builds = SingleFlight('summaries')
+_snapshots = OrderedDict()
+_snapshots_lock = threading.Lock()
+
+
+class Snapshot:
+    """One date's serialized summaries: JSON body, its encodings and a strong ETag"""
+
+    def __init__(self, date, body, encoded, stored=False):
+        self.date = date
+        self.body = body
+        self.encoded = encoded
+        self.stored = stored
+        self.etag = hashlib.sha256(body).hexdigest()
+        self._records = None
+
+    def records(self):
+        if self._records is None:
+            self._records = json.loads(self.body)
+        return self._records
+
+
+def _summary_path(date):
+    check_date(date)
+    return os.path.join(SUMMARY_DIR, f"v{SUMMARY_VERSION}", f"{date}.json")
+
+
+def is_storable(date):
+    """A day's summaries are stored for good only once its slate is over and its Statcast pull is final"""
+    return is_day_final(date) and slate_is_final(date) is True
+
+
+def has_placeholder_names(catchers):
+    """True if any catcher's name didn't resolve and fell back to the "Player <id>" placeholder"""
+    return any(catcher['player_name'] == f"Player {catcher['id']}" for catcher in catchers)
+
+
+def cache_control_for(snapshot):
+    if not snapshot.stored:
+        return TODAY_CACHE_CONTROL
+    settled = (datetime.now() - timedelta(days=SETTLE_DAYS)).strftime('%Y-%m-%d')
+    return FINAL_CACHE_CONTROL if snapshot.date < settled else RECENT_CACHE_CONTROL
+
+
+def serialize(catchers):
+    return json.dumps(catchers, separators=(',', ':')).encode()
+
+
+def encode_body(body, best=True):
+    """{Content-Encoding: compressed bytes}; best=False trades ratio for speed on per-request bodies"""
+    encoded = {}
+    if 'br' in ENCODINGS:
+        encoded['br'] = brotli.compress(body, quality=11 if best else 4)
+    # mtime=0 keeps the gzip bytes (and so the ETag) identical across rebuilds
+    encoded['gzip'] = gzip.compress(body, compresslevel=9 if best else 6, mtime=0)
+    return encoded
+
+
+def _remember(snapshot):
+    with _snapshots_lock:
+        _snapshots[snapshot.date] = snapshot
+        _snapshots.move_to_end(snapshot.date)
+        while len(_snapshots) > SNAPSHOT_MEMORY_ENTRIES:
+            _snapshots.popitem(last=False)
+    return snapshot
+
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(date):
+    """Stored snapshot for a date, or None if it hasn't been precomputed"""
+    with _snapshots_lock:
+        snapshot = _snapshots.get(date)
+        if snapshot is not None:
+            _snapshots.move_to_end(date)
+            return snapshot
+
+    path = _summary_path(date)
+    try:
+        with open(path, 'rb') as f:
+            body = f.read()
+    except FileNotFoundError:
+        return None
+
+    encoded = {}
+    for encoding, suffix in ENCODINGS.items():
+        try:
+            with open(path + suffix, 'rb') as f:
+                encoded[encoding] = f.read()
+        except FileNotFoundError:
+            pass
+    if len(encoded) < len(ENCODINGS):
+        # Stored before this encoding was available; compress once in memory
+        encoded = {**encode_body(body), **encoded}
+    return _remember(Snapshot(date, body, encoded, stored=True))
+
+
+def load_summaries(date):
+    """Stored summaries for a date, or None if it hasn't been precomputed"""
+    snapshot = load_snapshot(date)
+    return None if snapshot is None else snapshot.records()
+
+
+def save_summaries(date, catchers):
+    """Write a date's snapshot (encodings first, so the JSON file marks it complete)"""
+    path = _summary_path(date)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    body = serialize(catchers)
+    encoded = encode_body(body)
+    for encoding, suffix in ENCODINGS.items():
+        _write_atomic(path + suffix, encoded[encoding])
+    _write_atomic(path, body)
+    return _remember(Snapshot(date, body, encoded, stored=True))
+
+
+def build_catcher_summaries(date):
+    """Compute the catcher list for one date from Statcast"""
+    print(f"Fetching Statcast data for {date}...")
+
+    # Fetch real Statcast data (served from the local day cache when possible)
+    data = get_statcast_day(date)
+
+    if data.empty:
+        print("No data found for this date")
+        return []
+
+    # One grouped pass over every called pitch (see aggregation.py)
+    games = aggregate_catcher_games(data)
+
+    if games.empty:
+        return []
+
+    # Resolve every catcher's name in one bulk lookup
+    player_names = get_player_names(games['catcher_id'].unique())
+
+    return to_catcher_records(games, player_names, date=date)
+
+
+def get_snapshot(date):
+    """Precomputed snapshot when available, otherwise build (and store if final)"""
+    snapshot = load_snapshot(date)
+    count_cache('summaries', snapshot is not None)
+    if snapshot is not None:
+        return snapshot
+
+    # Concurrent requests for the same date share one build
+    return _builds.do(date, lambda: _build_and_store(date))
+
+
+def get_catcher_summaries(date):
+    """The catcher list for a date (see get_snapshot)"""
+    return get_snapshot(date).records()
+
+
+def _build_and_store(date):
+    catchers = build_catcher_summaries(date)
+    # An empty day may just be Savant lagging, so only store real results; a
+    # partial slate or an unresolved name is served but rebuilt on the next request
+    if catchers and is_storable(date) and not has_placeholder_names(catchers):
+        return save_summaries(date, catchers)
+    body = serialize(catchers)
+    return Snapshot(date, body, encode_body(body, best=False))
+
+
+def query_summaries(catchers, team=None, sort=None, limit=None, offset=0):
+    """Filter by team, sort by a SORT_FIELDS name ('-' prefix for descending) and page.
+
+    Returns (matching count, page); raises ValueError for an unknown sort field.
+    """
+    if team:
+        team = team.upper().strip()
+        team = TEAM_MAPPING.get(team, team)
+        catchers = [catcher for catcher in catchers if catcher['team'] == team]
+    if sort:
+        field = sort.lstrip('-')
+        if field not in SORT_FIELDS:
+            raise ValueError(f"Unknown sort field '{field}', use one of: {', '.join(SORT_FIELDS)}")
+        # Ties keep the snapshot order; None sorts last in both directions
+        present = [catcher for catcher in catchers if catcher.get(field) is not None]
+        missing = [catcher for catcher in catchers if catcher.get(field) is None]
+        catchers = sorted(present, key=lambda catcher: catcher[field], reverse=sort.startswith('-')) + missing
+    total = len(catchers)
+    end = None if limit is None else offset + limit
+    return total, catchers[offset:end]
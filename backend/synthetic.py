@@ -0,0 +1,108 @@
+"""Synthetic Statcast frames for benchmarks, tests and the fake Statcast source.
+
+The generator mimics the shape of a real ``pybaseball.statcast`` pull closely
+enough for timing work: ~300 pitches per game, 15 games per day, two catchers
+per game (one per fielding team) and a realistic mix of pitch outcomes and
+locations. No network access is needed.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+PITCHES_PER_GAME = 300
+GAMES_PER_DAY = 15
+
+# Rows in a typical day, month and regular season
+SCALES = {
+    'day': PITCHES_PER_GAME * GAMES_PER_DAY,
+    'month': PITCHES_PER_GAME * GAMES_PER_DAY * 30,
+    'season': PITCHES_PER_GAME * GAMES_PER_DAY * 162,
+}
+
+TEAMS = [
+    'LAA', 'HOU', 'OAK', 'SEA', 'TEX', 'CWS', 'CLE', 'DET', 'KC', 'MIN',
+    'NYY', 'BAL', 'BOS', 'TB', 'TOR', 'ATL', 'MIA', 'NYM', 'PHI', 'WSH',
+    'CHC', 'CIN', 'MIL', 'PIT', 'STL', 'AZ', 'COL', 'LAD', 'SD', 'SF',
+]
+
+DESCRIPTIONS = ['ball', 'called_strike', 'foul', 'hit_into_play', 'swinging_strike', 'blocked_ball', 'hit_by_pitch']
+DESCRIPTION_WEIGHTS = [0.33, 0.17, 0.18, 0.17, 0.11, 0.035, 0.005]
+
+PITCH_TYPES = ['FF', 'SI', 'FC', 'SL', 'ST', 'CH', 'CU', 'FS', 'KC', 'SV']
+PITCH_TYPE_WEIGHTS = [0.32, 0.15, 0.08, 0.15, 0.06, 0.11, 0.07, 0.03, 0.02, 0.01]
+
+
+# pybaseball.statcast returns ~92 columns; most are float64 or strings
+EXTRA_FLOAT_COLUMNS = 60
+EXTRA_STRING_COLUMNS = 17
+
+
+def widen_like_pybaseball(df, seed=0):
+    """Pad a synthetic frame with filler columns to the width of a real pull"""
+    rng = np.random.default_rng(seed)
+    n_rows = len(df)
+    wide = {column: df[column] for column in df.columns}
+    for i in range(EXTRA_FLOAT_COLUMNS):
+        wide[f'float_{i}'] = rng.normal(size=n_rows)
+    names = np.array([f'Player {i}' for i in range(500)], dtype=object)
+    for i in range(EXTRA_STRING_COLUMNS):
+        wide[f'text_{i}'] = names[rng.integers(0, len(names), n_rows)]
+    # The play description ('des') is a long, mostly unique string per pitch
+    wide['des'] = np.array([f"Pitch {i}: batter takes a pitch on the outside edge of the plate" for i in range(n_rows)],
+                           dtype=object)
+    return pd.DataFrame(wide)
+
+
+def synthetic_statcast(n_rows, start_date='2025-04-01', seed=0):
+    """Return a synthetic Statcast-like DataFrame with roughly ``n_rows`` pitches"""
+    rng = np.random.default_rng(seed)
+    n_games = max(1, n_rows // PITCHES_PER_GAME)
+    n_rows = n_games * PITCHES_PER_GAME
+
+    game_index = np.repeat(np.arange(n_games), PITCHES_PER_GAME)
+    first_day = date.fromisoformat(start_date)
+    game_days = [first_day + timedelta(days=int(i // GAMES_PER_DAY)) for i in range(n_games)]
+
+    # Each game pairs two teams; each team has a primary and a backup catcher
+    home = rng.integers(0, len(TEAMS), n_games)
+    away = (home + rng.integers(1, len(TEAMS), n_games)) % len(TEAMS)
+    home_catcher = 600000 + home * 2 + rng.integers(0, 2, n_games)
+    away_catcher = 600000 + away * 2 + rng.integers(0, 2, n_games)
+
+    top = rng.random(n_rows) < 0.5  # Top of the inning: home team is fielding
+    fielder_2 = np.where(top, home_catcher[game_index], away_catcher[game_index])
+
+    sz_top = rng.normal(3.35, 0.12, n_rows)
+    sz_bot = rng.normal(1.60, 0.08, n_rows)
+    plate_x = rng.normal(0.0, 0.85, n_rows)
+    plate_z = rng.normal(2.35, 0.95, n_rows)
+    plate_x[rng.random(n_rows) < 0.003] = np.nan  # Occasional untracked pitch
+
+    in_zone = (np.abs(plate_x) <= 0.83) & (plate_z >= sz_bot - 0.12) & (plate_z <= sz_top + 0.12)
+    description = rng.choice(DESCRIPTIONS, n_rows, p=DESCRIPTION_WEIGHTS)
+    # Make takes look like real umpiring: mostly strikes in the zone, balls outside
+    taken = np.isin(description, ['ball', 'called_strike'])
+    miss = rng.random(n_rows) < 0.08
+    description = np.where(taken, np.where(in_zone ^ miss, 'called_strike', 'ball'), description)
+
+    pitch_type = rng.choice(PITCH_TYPES, n_rows, p=PITCH_TYPE_WEIGHTS).astype(object)
+    pitch_type[rng.random(n_rows) < 0.002] = None
+
+    return pd.DataFrame({
+        'game_pk': 745000 + game_index,
+        'game_date': pd.to_datetime([game_days[i] for i in game_index]),
+        'fielder_2': fielder_2.astype(float),
+        'description': description,
+        'pitch_type': pitch_type,
+        'stand': rng.choice(['R', 'L'], n_rows, p=[0.56, 0.44]),
+        'plate_x': plate_x,
+        'plate_z': plate_z,
+        'sz_top': sz_top,
+        'sz_bot': sz_bot,
+        'home_team': np.array(TEAMS, dtype=object)[home[game_index]],
+        'away_team': np.array(TEAMS, dtype=object)[away[game_index]],
+        'inning_topbot': np.where(top, 'Top', 'Bot'),
+        'balls': rng.integers(0, 4, n_rows),
+        'strikes': rng.integers(0, 3, n_rows),
+    })
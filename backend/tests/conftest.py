@@ -0,0 +1,24 @@
+"""Offline test setup, run from the backend directory with ``python -m pytest tests``.
+
+Every cache points at a throwaway directory and Statcast comes from the fake
+source (fakes.py), so nothing touches the network or the real .cache. This
+must happen before the backend modules are imported, since they read their
+paths from the environment at import time.
+"""
+import os
+import sys
+import tempfile
+
+_cache_root = tempfile.mkdtemp(prefix='framing-tests-')
+os.environ.update({
+    'STATCAST_SOURCE': 'fake',
+    'STATCAST_CACHE_DIR': os.path.join(_cache_root, 'statcast'),
+    'SUMMARY_DIR': os.path.join(_cache_root, 'summaries'),
+    'ROLLUP_DB_PATH': os.path.join(_cache_root, 'rollups.sqlite3'),
+    'PLOT_CACHE_DIR': os.path.join(_cache_root, 'plots'),
+    'PLAYER_DB_PATH': os.path.join(_cache_root, 'players.sqlite3'),
+    'STRIKE_MODEL_DIR': os.path.join(_cache_root, 'strike_model'),
+    'RENDER_PROCESSES': '0',
+})
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,67 @@
+"""ingest.py against the fake Statcast source: interrupted backfills resume"""
+import os
+import time
+
+import pytest
+
+import fakes
+import ingest
+import statcast_cache
+
+# Two February off-season days, then in-season March days
+START, END = '2024-02-28', '2024-03-03'
+FAILING = {'2024-03-02'}
+
+
+@pytest.fixture
+def source(monkeypatch, tmp_path):
+    """The fake source with a per-date call count; dates in source.failing always fail"""
+    monkeypatch.setattr(statcast_cache, 'CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(statcast_cache, '_memory', statcast_cache.DayLRU(statcast_cache.MEMORY_CAP_BYTES))
+    # No waiting between retries
+    monkeypatch.setattr(ingest.time, 'sleep', lambda seconds: None)
+
+    calls = {}
+
+    def fetch(start_dt, end_dt=None, **kwargs):
+        calls[start_dt] = calls.get(start_dt, 0) + 1
+        if start_dt in fetch.failing:
+            raise ConnectionError(f"Savant is down for {start_dt}")
+        return fakes.fake_statcast(start_dt, end_dt, **kwargs)
+
+    fetch.calls = calls
+    fetch.failing = set(FAILING)
+    monkeypatch.setattr(statcast_cache, '_statcast_source', lambda: fetch)
+    return fetch
+
+
+def age_store(hours):
+    """Make every stored day look as if it was pulled hours ago (past the today TTL)"""
+    pulled_at = time.time() - hours * 3600
+    for root, _, files in os.walk(statcast_cache.CACHE_DIR):
+        for name in files:
+            os.utime(os.path.join(root, name), (pulled_at, pulled_at))
+
+
+def test_resume_fetches_only_days_that_failed(source):
+    fetched, failed = ingest.ingest_range(START, END, workers=2)
+    assert failed == sorted(FAILING)
+    assert fetched == ['2024-02-28', '2024-02-29', '2024-03-01', '2024-03-03']
+    assert source.calls['2024-03-02'] == ingest.FETCH_ATTEMPTS
+    assert ingest.pending_days(START, END) == sorted(FAILING)
+
+    # Resumed later on: off days were stored empty and aren't pulled again
+    age_store(hours=1)
+    source.failing.clear()
+    source.calls.clear()
+    fetched, failed = ingest.ingest_range(START, END, workers=2)
+    assert (fetched, failed) == (sorted(FAILING), [])
+    assert source.calls == {'2024-03-02': 1}
+    assert ingest.pending_days(START, END) == []
+
+
+def test_stored_days_are_served_from_disk(source):
+    ingest.ingest_range('2024-03-01', '2024-03-01', workers=1)
+    day = statcast_cache.get_statcast_day('2024-03-01')
+    assert len(day) > 0
+    assert source.calls == {'2024-03-01': 1}
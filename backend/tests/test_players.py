@@ -0,0 +1,62 @@
+"""players.py against the fake people endpoint: bulk lookups and the local store"""
+import threading
+
+import pytest
+from werkzeug.serving import make_server
+
+import fakes
+import players
+
+
+@pytest.fixture
+def people_api(monkeypatch, tmp_path):
+    """fakes.people_app() on a free local port; .requests lists each personIds query"""
+    app = fakes.people_app()
+    requests_seen = []
+
+    @app.before_request
+    def record():
+        from flask import request
+        requests_seen.append(request.args.get('personIds'))
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    monkeypatch.setattr(players, 'MLB_STATSAPI_URL', f"http://127.0.0.1:{server.server_port}/api/v1")
+    monkeypatch.setattr(players, 'PLAYER_DB_PATH', str(tmp_path / 'players.sqlite3'))
+    monkeypatch.setattr(players, '_names', {})
+    monkeypatch.setattr(players, '_misses', {})
+    monkeypatch.setattr(players, '_session', None)
+
+    def no_register():
+        raise AssertionError("the Chadwick register must not be downloaded during a lookup")
+
+    monkeypatch.setattr(players.pyb, 'chadwick_register', no_register)
+    server.requests = requests_seen
+    yield server
+    server.shutdown()
+    thread.join()
+
+
+def test_bulk_lookup_is_one_batched_request(people_api):
+    known = list(fakes.SAMPLE_PEOPLE)
+    names = players.get_player_names(known + [1])
+
+    assert names == {**fakes.SAMPLE_PEOPLE, 1: 'Player 1'}
+    assert len(people_api.requests) == 1
+    assert set(people_api.requests[0].split(',')) == {str(player_id) for player_id in known + [1]}
+
+
+def test_resolved_names_come_from_the_store(people_api, monkeypatch):
+    players.get_player_names(list(fakes.SAMPLE_PEOPLE))
+    # A fresh process: nothing in memory, so names are read back from SQLite
+    monkeypatch.setattr(players, '_names', {})
+    assert players.get_player_names([592663, 663728]) == {592663: 'J.T. Realmuto', 663728: 'Cal Raleigh'}
+    assert len(people_api.requests) == 1
+
+
+def test_unknown_ids_are_not_retried_every_request(people_api):
+    assert players.get_player_name(1) == 'Player 1'
+    assert players.get_player_name(1) == 'Player 1'
+    assert people_api.requests == ['1']
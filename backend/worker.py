@@ -0,0 +1,134 @@
+"""Background precompute worker for finished slates.
+
+Pulls each completed day once its games are final, stores the catcher
+summaries (summaries.py), daily rollups (rollups.py) and the season's
+called-strike grid (strike_model.py), keeps the player directory seeded
+(players.py), and can pre-render
+every catcher's shadow-zone plot through the render pool (render_pool.py) so
+the API only ever serves precomputed results.
+
+    python worker.py --date 2025-06-01 --render-plots   # one day, then exit
+    python worker.py --watch --render-plots             # keep running
+
+In production gunicorn starts the watch loop beside the web workers (see
+gunicorn.conf.py), since both must share the same cache directories.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from app import render_catcher_plot
+from players import refresh_register
+from render_pool import configure_render_pool, get_render_pool
+from rollups import ingest_day
+from schedule import slate_is_final
+from strike_model import refit_season_grid
+from summaries import build_catcher_summaries, has_placeholder_names, is_storable, load_summaries, save_summaries
+
+WATCH_INTERVAL_SECONDS = int(os.environ.get('WORKER_INTERVAL_SECONDS', 15 * 60))
+LOOKBACK_DAYS = 3
+
+
+def _render_one(job):
+    catcher_id, game_pk, date = job
+    try:
+        digest, _ = render_catcher_plot(catcher_id, game_pk, date)
+        return digest is not None
+    except Exception as e:
+        print(f"Error pre-rendering plot for catcher {catcher_id}, game {game_pk}: {e}")
+        return False
+
+
+def prerender_plots(date, catchers):
+    """Render every catcher's plot for the day into the plot cache"""
+    jobs = [(catcher['id'], catcher['game_pk'], date) for catcher in catchers]
+    if not jobs:
+        return 0
+    pool = get_render_pool()
+    # One feeder thread per render process keeps the pool busy without overfilling it
+    with ThreadPoolExecutor(max_workers=max(pool.processes, 1)) as feeders:
+        rendered = sum(feeders.map(_render_one, jobs))
+    print(f"Pre-rendered {rendered}/{len(jobs)} plots for {date}")
+    return rendered
+
+
+def precompute_day(date, render_plots=False, allow_empty=False):
+    """Build and store everything the API serves for one finished date"""
+    started = time.time()
+    catchers = build_catcher_summaries(date)
+    ingest_day(date)
+    if not is_storable(date):
+        # Picked up again on the next pass (see pending_dates); plots rendered
+        # now wouldn't be cached, so they wait too
+        print(f"Not storing {date} yet: the slate or its Statcast pull isn't final")
+        return catchers
+    if has_placeholder_names(catchers):
+        print(f"Not storing {date} yet: some catcher names didn't resolve")
+    elif catchers or allow_empty:
+        save_summaries(date, catchers)
+    # Refit the season's called-strike grid now rather than on the next API request
+    refit_season_grid(date[:4])
+    if render_plots:
+        prerender_plots(date, catchers)
+    print(f"Precomputed {len(catchers)} catchers for {date} in {time.time() - started:.1f}s")
+    return catchers
+
+
+def refresh_names():
+    """Keep the player directory seeded from the Chadwick register (weekly)"""
+    try:
+        refresh_register()
+    except Exception as e:
+        print(f"Error loading Chadwick register: {e}")
+
+
+def pending_dates(lookback_days=LOOKBACK_DAYS):
+    """Recent finished dates that haven't been precomputed yet, oldest first"""
+    today = datetime.now().date()
+    dates = [(today - timedelta(days=offset)).isoformat() for offset in range(lookback_days, 0, -1)]
+    return [date for date in dates if load_summaries(date) is None]
+
+
+def watch(render_plots=False, interval=WATCH_INTERVAL_SECONDS, lookback_days=LOOKBACK_DAYS):
+    """Precompute each recent day as soon as its slate is final, forever"""
+    print(f"Worker watching the last {lookback_days} days every {interval}s")
+    while True:
+        refresh_names()
+        for date in pending_dates(lookback_days):
+            final = slate_is_final(date)
+            if final is False:
+                print(f"Games on {date} are not all final yet")
+                continue
+            try:
+                # A schedule-confirmed final day with no catchers is an off day
+                precompute_day(date, render_plots, allow_empty=bool(final))
+            except Exception as e:
+                print(f"Error precomputing {date}: {e}")
+        time.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute catcher summaries and plots for finished days")
+    parser.add_argument('--date', action='append', help="Date to precompute (YYYY-MM-DD); repeatable")
+    parser.add_argument('--watch', action='store_true', help="Keep running and precompute each new final day")
+    parser.add_argument('--render-plots', action='store_true', help="Also pre-render every catcher's plot")
+    parser.add_argument('--processes', type=int, default=None, help="Plot rendering processes (default: RENDER_PROCESSES)")
+    parser.add_argument('--interval', type=int, default=WATCH_INTERVAL_SECONDS, help="Seconds between checks")
+    args = parser.parse_args()
+
+    if args.processes:
+        configure_render_pool(args.processes)
+
+    if args.watch:
+        watch(args.render_plots, args.interval)
+    else:
+        refresh_names()
+        dates = args.date or [(datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')]
+        for date in dates:
+            precompute_day(date, args.render_plots)
+
+
+if __name__ == '__main__':
+    main()
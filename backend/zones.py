@@ -0,0 +1,131 @@
+"""Vectorized pitch-location zone classification.
+
+Everything here works on whole columns at once, so labelling a full season of
+pitches is a handful of NumPy comparisons instead of one Python call per row.
+Coordinates are in feet from the catcher's perspective (Statcast ``plate_x`` /
+``plate_z``), with each pitch's own ``sz_top`` / ``sz_bot``.
+"""
+import numpy as np
+import pandas as pd
+
+BALL_RADIUS = 0.1208
+PLATE_HALF_WIDTH = 0.7083
+
+# Shadow zone margins
+HORIZONTAL_MARGIN = 0.3   # About 3.6 inches
+VERTICAL_MARGIN = 0.4     # About 4.8 inches - bigger for top/bottom
+EDGE_MARGIN = 0.2         # Borderline inside zone
+
+# Chase region extends this far beyond the zone; anything further out is waste
+CHASE_HORIZONTAL_MARGIN = 0.8
+CHASE_VERTICAL_MARGIN = 0.9
+
+# Locations are stored as float32 (see statcast_cache.py); Statcast itself
+# reports them with no more than this many decimals
+STORED_DECIMALS = 4
+
+# Zone codes (int8). Order matters: it is the categorical order of ZONE_LABELS.
+MISSING = -1
+TRUE_ZONE = 0
+SHADOW_EDGE = 1
+SHADOW_HORIZONTAL = 2
+SHADOW_VERTICAL = 3
+CHASE = 4
+WASTE = 5
+
+ZONE_LABELS = ['true_zone', 'shadow_edge', 'shadow_horizontal', 'shadow_vertical', 'chase', 'waste']
+SHADOW_CODES = (SHADOW_EDGE, SHADOW_HORIZONTAL, SHADOW_VERTICAL)
+
+
+def _as_float64(values):
+    """Widen to float64; float32 inputs are rounded back to the decimals Statcast publishes"""
+    values = np.asarray(values)
+    if values.dtype == np.float32:
+        # Without this, a pitch sitting exactly on a zone edge (e.g. z == sz_top + 0.4)
+        # can land on either side depending on float32 rounding
+        return np.round(values.astype(np.float64), STORED_DECIMALS)
+    return values.astype(float, copy=False)
+
+
+def _columns(df):
+    return (
+        df['plate_x'].to_numpy(na_value=np.nan),
+        df['plate_z'].to_numpy(na_value=np.nan),
+        df['sz_top'].to_numpy(na_value=np.nan),
+        df['sz_bot'].to_numpy(na_value=np.nan),
+    )
+
+
+def zone_codes_from_arrays(x, z, sz_top, sz_bot):
+    """Return an int8 zone code per pitch (MISSING where any input is NaN)"""
+    x = _as_float64(x)
+    z = _as_float64(z)
+    sz_top = _as_float64(sz_top)
+    sz_bot = _as_float64(sz_bot)
+
+    edge = PLATE_HALF_WIDTH
+    abs_x = np.abs(x)
+
+    in_box = (abs_x <= edge) & (z >= sz_bot) & (z <= sz_top)
+
+    # Borderline inside zone (edges of zones 1, 2, 3, 4, 6, 7, 8, 9)
+    barely_in_zone = in_box & (
+        (x > edge - EDGE_MARGIN) | (x < -edge + EDGE_MARGIN) |
+        (z > sz_top - EDGE_MARGIN) | (z < sz_bot + EDGE_MARGIN)
+    )
+
+    # Left and right of plate (attack zones 11-17)
+    in_horizontal_shadow = (
+        (abs_x > edge) & (abs_x <= edge + HORIZONTAL_MARGIN) &
+        (z >= sz_bot - VERTICAL_MARGIN) & (z <= sz_top + VERTICAL_MARGIN)
+    )
+
+    # Above and below the zone (attack zones 18, 19)
+    in_vertical_shadow = (
+        ((z > sz_top) & (z <= sz_top + VERTICAL_MARGIN)) |
+        ((z < sz_bot) & (z >= sz_bot - VERTICAL_MARGIN))
+    ) & (abs_x <= edge + HORIZONTAL_MARGIN)
+
+    in_chase = (
+        (abs_x <= edge + CHASE_HORIZONTAL_MARGIN) &
+        (z >= sz_bot - CHASE_VERTICAL_MARGIN) & (z <= sz_top + CHASE_VERTICAL_MARGIN)
+    )
+
+    # np.select picks the first matching condition, so order is precedence
+    codes = np.select(
+        [barely_in_zone, in_box, in_horizontal_shadow, in_vertical_shadow, in_chase],
+        [SHADOW_EDGE, TRUE_ZONE, SHADOW_HORIZONTAL, SHADOW_VERTICAL, CHASE],
+        default=WASTE,
+    ).astype(np.int8)
+
+    missing = np.isnan(x) | np.isnan(z) | np.isnan(sz_top) | np.isnan(sz_bot)
+    codes[missing] = MISSING
+    return codes
+
+
+def zone_codes(df):
+    """Return an int8 zone code per row of a Statcast DataFrame"""
+    return zone_codes_from_arrays(*_columns(df))
+
+
+def classify_zones(df):
+    """Label every pitch with its zone as a pandas Categorical Series"""
+    codes = zone_codes(df)
+    labels = pd.Categorical.from_codes(codes, categories=ZONE_LABELS)
+    return pd.Series(labels, index=df.index, name='zone')
+
+
+def is_in_shadow_zone(df):
+    """Boolean array: pitch is in a shadow zone (Baseball Savant attack zone style)"""
+    return np.isin(zone_codes(df), SHADOW_CODES)
+
+
+def is_in_strike_zone(df):
+    """Boolean array: any part of the ball touches the rulebook strike zone"""
+    x, z, sz_top, sz_bot = _columns(df)
+    return (
+        (x - BALL_RADIUS <= PLATE_HALF_WIDTH) &
+        (x + BALL_RADIUS >= -PLATE_HALF_WIDTH) &
+        (z + BALL_RADIUS >= sz_bot) &
+        (z - BALL_RADIUS <= sz_top)
+    )
@@ -23,6 +23,13 @@ function App() {
     fetchCatcherData(selectedDate);
   }, [selectedDate]);
 
+  useEffect(() => {
+    // Release the previous plot's object URL when it is replaced or cleared
+    return () => {
+      if (plotImage) URL.revokeObjectURL(plotImage);
+    };
+  }, [plotImage]);
+
   const fetchCatcherData = async (date) => {
     setLoading(true);
     setError(null);
@@ -51,12 +58,14 @@ function App() {
   const fetchGameSummaryPlot = async (catcher) => {
     setPlotLoading(true);
     try {
-     const response = await fetch(`https://framing-summary-production.up.railway.app/api/plot/${catcher.id}/${catcher.game_pk}?date=${selectedDate}`);
-      const data = await response.json();
+     const response = await fetch(`https://framing-summary-production.up.railway.app/api/plot/${catcher.id}/${catcher.game_pk}/image?date=${selectedDate}`);
       
-      if (response.ok && data.image) {
-        setPlotImage(data.image);
+      if (response.ok) {
+        // Keep the PNG as a binary blob instead of a giant base64 data URI
+        const blob = await response.blob();
+        setPlotImage(URL.createObjectURL(blob));
       } else {
+        const data = await response.json().catch(() => ({}));
         setError('Failed to generate plot: ' + (data.error || 'Unknown error'));
       }
     } catch (error) {